@@ -292,6 +292,10 @@ def background_scanner():
     """Background thread that scans and sends live alerts."""
     global background_scanner_running, scan_results_cache
     
+    # Scans start on a fixed cadence: the wait below only covers whatever is
+    # left of the interval after the scan itself.
+    next_scan = time.monotonic()
+    
     while background_scanner_running:
         try:
             # Notify clients scan is starting
@@ -348,8 +352,10 @@ def background_scanner():
                 "message": f"Scan error: {str(e)}",
             })
         
-        # Wait for next scan
-        time.sleep(background_scanner_interval)
+        # Wait for next scan (start right away if this one overran)
+        now = time.monotonic()
+        next_scan = max(next_scan + background_scanner_interval, now)
+        time.sleep(next_scan - now)
 
 
 @app.route('/live/scanner/start', methods=['POST'])
@@ -461,16 +467,17 @@ def scan_target():
     This API is working as of 2026 - returns real stock data.
     """
     try:
-        from scanners.stock_checker import scan_target as _scan_target
+        from scanners.stock_checker import scan_target as _scan_target, summarize_products
         query = request.args.get("q", "pokemon trading cards")
         zip_code = request.args.get("zip", "90210")
         products = _scan_target(query, zip_code)
+        total, in_stock_count, dicts = summarize_products(products)
         return jsonify({
             "success": True,
             "retailer": "Target",
-            "total_found": len(products),
-            "in_stock_count": len([p for p in products if p.stock]),
-            "products": [p.to_dict() for p in products],
+            "total_found": total,
+            "in_stock_count": in_stock_count,
+            "products": dicts,
         })
     except Exception as e:
         return jsonify({"error": str(e)})
@@ -481,15 +488,16 @@ def scan_target():
 def scan_bestbuy():
     """Scan Best Buy for Pokemon products."""
     try:
-        from scanners.stock_checker import scan_bestbuy as _scan_bestbuy
+        from scanners.stock_checker import scan_bestbuy as _scan_bestbuy, summarize_products
         query = request.args.get("q", "pokemon trading cards")
         products = _scan_bestbuy(query)
+        total, in_stock_count, dicts = summarize_products(products)
         return jsonify({
             "success": True,
             "retailer": "Best Buy",
-            "total_found": len(products),
-            "in_stock_count": len([p for p in products if p.stock]),
-            "products": [p.to_dict() for p in products],
+            "total_found": total,
+            "in_stock_count": in_stock_count,
+            "products": dicts,
         })
     except Exception as e:
         return jsonify({"error": str(e)})
@@ -500,15 +508,16 @@ def scan_bestbuy():
 def scan_gamestop():
     """Scan GameStop for Pokemon products."""
     try:
-        from scanners.stock_checker import scan_gamestop as _scan_gamestop
+        from scanners.stock_checker import scan_gamestop as _scan_gamestop, summarize_products
         query = request.args.get("q", "pokemon cards")
         products = _scan_gamestop(query)
+        total, in_stock_count, dicts = summarize_products(products)
         return jsonify({
             "success": True,
             "retailer": "GameStop",
-            "total_found": len(products),
-            "in_stock_count": len([p for p in products if p.stock]),
-            "products": [p.to_dict() for p in products],
+            "total_found": total,
+            "in_stock_count": in_stock_count,
+            "products": dicts,
         })
     except Exception as e:
         return jsonify({"error": str(e)})
@@ -523,15 +532,16 @@ def scan_pokemoncenter():
     Has exclusives like ETBs and promo cards.
     """
     try:
-        from scanners.stock_checker import scan_pokemoncenter as _scan_pokemoncenter
+        from scanners.stock_checker import scan_pokemoncenter as _scan_pokemoncenter, summarize_products
         query = request.args.get("q", "trading cards")
         products = _scan_pokemoncenter(query)
+        total, in_stock_count, dicts = summarize_products(products)
         return jsonify({
             "success": True,
             "retailer": "Pokemon Center",
-            "total_found": len(products),
-            "in_stock_count": len([p for p in products if p.stock]),
-            "products": [p.to_dict() for p in products],
+            "total_found": total,
+            "in_stock_count": in_stock_count,
+            "products": dicts,
         })
     except Exception as e:
         return jsonify({"error": str(e)})
@@ -20,8 +20,10 @@ Author: LO TCG Bot
 import json
 import os
 import sys
+import threading
 import time
 import re
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -473,8 +475,15 @@ class CardPriceReport:
 # CACHE
 # =============================================================================
 
+# In-process LRU in front of the per-key JSON files: repeat lookups of the
+# same card within the TTL skip the open/read/parse entirely.
+PRICE_CACHE_MEM_MAX_ENTRIES = 256
+_price_cache_mem: "OrderedDict[str, Tuple[datetime, Dict]]" = OrderedDict()
+_price_cache_mem_lock = threading.Lock()
+
+
 class PriceCache:
-    """Simple file-based cache for price data."""
+    """Simple file-based cache for price data (LRU-fronted)."""
     
     @staticmethod
     def _get_key(card_name: str, set_name: str = "") -> str:
@@ -482,9 +491,26 @@ class PriceCache:
         key_str = f"{card_name}_{set_name}".lower()
         return hashlib.md5(key_str.encode()).hexdigest()
     
+    @staticmethod
+    def _mem_put(key: str, cached_at: datetime, data: Dict):
+        with _price_cache_mem_lock:
+            _price_cache_mem[key] = (cached_at, data)
+            _price_cache_mem.move_to_end(key)
+            while len(_price_cache_mem) > PRICE_CACHE_MEM_MAX_ENTRIES:
+                _price_cache_mem.popitem(last=False)
+    
     @staticmethod
     def get(card_name: str, set_name: str = "") -> Optional[Dict]:
         key = PriceCache._get_key(card_name, set_name)
+        ttl = timedelta(seconds=CACHE_TTL_SECONDS)
+        
+        with _price_cache_mem_lock:
+            entry = _price_cache_mem.get(key)
+            if entry is not None:
+                _price_cache_mem.move_to_end(key)
+        if entry is not None and datetime.now() - entry[0] <= ttl:
+            return entry[1]
+        
         cache_file = CACHE_DIR / f"graded_{key}.json"
         
         if not cache_file.exists():
@@ -495,9 +521,10 @@ class PriceCache:
                 data = json.load(f)
             
             cached_at = datetime.fromisoformat(data.get("cached_at", "2000-01-01"))
-            if datetime.now() - cached_at > timedelta(seconds=CACHE_TTL_SECONDS):
+            if datetime.now() - cached_at > ttl:
                 return None
             
+            PriceCache._mem_put(key, cached_at, data)
             return data
         except:
             return None
@@ -507,7 +534,9 @@ class PriceCache:
         key = PriceCache._get_key(card_name, set_name)
         cache_file = CACHE_DIR / f"graded_{key}.json"
         
-        data["cached_at"] = datetime.now().isoformat()
+        cached_at = datetime.now()
+        data["cached_at"] = cached_at.isoformat()
+        PriceCache._mem_put(key, cached_at, data)
         
         try:
             with open(cache_file, "w") as f:
@@ -588,13 +617,16 @@ def get_raw_price_from_api(card_name: str, set_name: str = "") -> Optional[Dict]
 # EBAY SOLD LISTINGS - GRADED PRICES
 # =============================================================================
 
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_TITLE_STOPWORDS = frozenset({"the", "a", "an", "or", "in", "of", "to", "for", "pokemon", "card", "cards"})
+
+
 def _significant_words(s: str) -> List[str]:
     """Extract significant words (len > 1, skip stopwords) for title matching."""
     if not s:
         return []
-    words = re.findall(r"[a-z0-9]+", s.lower())
-    stop = {"the", "a", "an", "or", "in", "of", "to", "for", "pokemon", "card", "cards"}
-    return [w for w in words if len(w) > 1 and w not in stop]
+    words = _WORD_RE.findall(s.lower())
+    return [w for w in words if len(w) > 1 and w not in _TITLE_STOPWORDS]
 
 
 def _listing_matches_asset(
@@ -1048,16 +1080,20 @@ def get_pricecharting_prices(card_name: str, set_name: str = "", card_number: st
         return None
 
 
+_CURRENCY_RE = re.compile(r'[,$£€]')
+_PRICE_NUMBER_RE = re.compile(r'[\d,]+\.?\d*')
+
+
 def _parse_price(price_str: str) -> float:
     """Parse a price string like '$1,155.00' or '1155' into a float."""
     if not price_str:
         return 0
     
     # Remove currency symbols and commas
-    cleaned = re.sub(r'[,$£€]', '', price_str.strip())
+    cleaned = _CURRENCY_RE.sub('', price_str.strip())
     
     # Try to extract the number
-    match = re.search(r'[\d,]+\.?\d*', cleaned)
+    match = _PRICE_NUMBER_RE.search(cleaned)
     if match:
         try:
             return float(match.group().replace(',', ''))
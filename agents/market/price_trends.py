@@ -362,8 +362,9 @@ class PriceTrendAnalyzer:
         else:
             trend = 0.01    # Strong upward (hot card)
         
+        now = datetime.now()  # One clock read: points are exactly a day apart
         for i in range(days):
-            dt = datetime.now() - timedelta(days=days-i)
+            dt = now - timedelta(days=days-i)
             
             # Add trend + random noise
             volatility = random.gauss(0, 0.03)  # 3% daily volatility
@@ -299,6 +299,9 @@ class LocalStockMap:
         # Scan each retailer for stock
         retailer_stock = self._scan_retailers(query)
         
+        # Every store comes from the same retailer scan; stamp them once
+        now_iso = datetime.now().isoformat()
+        
         for store_info in nearby:
             chain = store_info["chain"]
             chain_info = STORE_CHAINS.get(chain, {})
@@ -350,7 +353,7 @@ class LocalStockMap:
                 phone=store_info.get("phone", ""),
                 hours=store_info.get("hours", ""),
                 aisle_location=primary_aisle,
-                last_checked=datetime.now().isoformat(),
+                last_checked=now_iso,
             ))
         
         # Add Pokemon Center (online)
@@ -374,22 +377,32 @@ class LocalStockMap:
                 phone="1-855-Pokemon",
                 hours="24/7 Online",
                 aisle_location="N/A - Ships to You",
-                last_checked=datetime.now().isoformat(),
+                last_checked=now_iso,
             ))
         
-        # Build summary
-        stores_with_stock = len([s for s in stores if s.has_stock])
-        
+        # Build summary in one pass over stores (not one pass per chain)
+        stores_with_stock = 0
         summary = {
             chain: {
                 "emoji": info["emoji"],
-                "stores_checked": len([s for s in stores if s.chain == chain]),
-                "stores_with_stock": len([s for s in stores if s.chain == chain and s.has_stock]),
-                "total_products": sum(s.stock_count for s in stores if s.chain == chain),
+                "stores_checked": 0,
+                "stores_with_stock": 0,
+                "total_products": 0,
             }
             for chain, info in STORE_CHAINS.items()
         }
         
+        for s in stores:
+            if s.has_stock:
+                stores_with_stock += 1
+            chain_summary = summary.get(s.chain)
+            if chain_summary is None:
+                continue
+            chain_summary["stores_checked"] += 1
+            chain_summary["total_products"] += s.stock_count
+            if s.has_stock:
+                chain_summary["stores_with_stock"] += 1
+        
         return StockMapResult(
             zip_code=self.zip_code,
             search_radius=self.radius,
@@ -399,7 +412,7 @@ class LocalStockMap:
             total_products=total_products,
             stores=stores,
             summary=summary,
-            generated_at=datetime.now().isoformat(),
+            generated_at=now_iso,
         )
     
     def _scan_retailers(self, query: str) -> Dict[str, List[Dict]]:
@@ -13,6 +13,7 @@ import re
 from typing import Dict, List, Optional, Callable
 from datetime import datetime
 from dataclasses import dataclass, asdict
+from functools import partial
 from pathlib import Path
 
 from agents.utils.logger import get_logger
@@ -155,6 +156,18 @@ class AlertProcessor:
         else:
             return "general_alert"
     
+    def _emit_stock_check_results(self, alert_dict: Dict, result: Dict):
+        """Stock check callback: emit stock_found for each in-stock product."""
+        products = result.get("products", [])
+        for product in products:
+            if product.get("stock"):
+                stock_found.send(
+                    None,
+                    product=product,
+                    source="alert_ingestion",
+                    alert=alert_dict
+                )
+    
     def process_alert(self, alert: Alert) -> Dict:
         """
         Process an alert and convert to signals.
@@ -215,21 +228,9 @@ class AlertProcessor:
         
         # If query found, trigger stock check
         elif extracted_query:
-            def callback(result):
-                # Process results and emit signals
-                products = result.get("products", [])
-                for product in products:
-                    if product.get("stock"):
-                        stock_found.send(
-                            None,
-                            product=product,
-                            source="alert_ingestion",
-                            alert=alert.to_dict()
-                        )
-            
             request_stock_check(
                 extracted_query,
-                callback=callback
+                callback=partial(self._emit_stock_check_results, alert.to_dict())
             )
             signals_triggered.append("stock_check_requested")
         
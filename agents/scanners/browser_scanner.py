@@ -8,6 +8,7 @@ that block regular HTTP requests. Slower but much more reliable.
 Only used when requests-based scraping fails or is blocked.
 """
 import os
+import re
 import time
 import random
 from typing import List, Optional, Dict, Any
@@ -44,10 +45,12 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 try:
-    from stock_checker import Product
+    from stock_checker import Product, MAX_SCRAPED_PRODUCTS
 except ImportError:
     # Fallback: define Product if import fails
     from dataclasses import dataclass
+    MAX_SCRAPED_PRODUCTS = 20
+    
     @dataclass
     class Product:
         name: str
@@ -68,6 +71,12 @@ except ImportError:
 # CAPTCHA SOLVING
 # =============================================================================
 
+# Common CAPTCHA indicators, matched in one case-insensitive scan
+_CAPTCHA_INDICATOR_RE = re.compile(
+    r"captcha|cloudflare|i'm not a robot|verify you are human", re.IGNORECASE
+)
+_SITEKEY_RE = re.compile(r'data-sitekey="([^"]+)"')
+
 def solve_captcha(driver: webdriver.Chrome) -> bool:
     """
     Detect and solve CAPTCHA if present.
@@ -78,21 +87,11 @@ def solve_captcha(driver: webdriver.Chrome) -> bool:
         return False
     
     try:
-        # Check for common CAPTCHA indicators
-        captcha_indicators = [
-            "captcha",
-            "recaptcha",
-            "hcaptcha",
-            "cloudflare",
-            "i'm not a robot",
-            "verify you are human"
-        ]
-        
-        page_text = driver.page_source.lower()
-        has_captcha = any(indicator in page_text for indicator in captcha_indicators)
-        
-        if not has_captcha:
+        # page_source is a WebDriver round trip - fetch it once
+        page_source = driver.page_source
+        if not _CAPTCHA_INDICATOR_RE.search(page_source):
             return False
+        page_text = page_source.lower()
         
         print("🔒 CAPTCHA detected, attempting to solve...")
         
@@ -109,10 +108,9 @@ def solve_captcha(driver: webdriver.Chrome) -> bool:
                     try:
                         recaptcha_elem = driver.find_element(By.CSS_SELECTOR, "[data-sitekey]")
                         sitekey = recaptcha_elem.get_attribute("data-sitekey")
-                    except:
+                    except Exception:
                         # Try to extract from page source
-                        import re
-                        match = re.search(r'data-sitekey="([^"]+)"', driver.page_source)
+                        match = _SITEKEY_RE.search(page_source)
                         if match:
                             sitekey = match.group(1)
                     
@@ -138,9 +136,8 @@ def solve_captcha(driver: webdriver.Chrome) -> bool:
                     try:
                         hcaptcha_elem = driver.find_element(By.CSS_SELECTOR, "[data-sitekey]")
                         sitekey = hcaptcha_elem.get_attribute("data-sitekey")
-                    except:
-                        import re
-                        match = re.search(r'data-sitekey="([^"]+)"', driver.page_source)
+                    except Exception:
+                        match = _SITEKEY_RE.search(page_source)
                         if match:
                             sitekey = match.group(1)
                     
@@ -180,16 +177,27 @@ def solve_captcha(driver: webdriver.Chrome) -> bool:
 # SESSION WARMING
 # =============================================================================
 
+# The pooled browser keeps its cookies between scans, so a retailer warmed
+# in it stays warm for a while: retailer -> (driver, time.monotonic())
+WARM_SESSION_TTL_SECONDS = 1800
+_warmed_sessions: Dict[str, Any] = {}
+
+
 def warm_session(driver: webdriver.Chrome, retailer: str) -> bool:
     """
     Warm up session by visiting homepage and browsing.
     Makes the browser look more like a real user.
     
-    Returns True if successful.
+    Skipped when this same browser warmed the retailer within
+    WARM_SESSION_TTL_SECONDS. Returns True if successful.
     """
     if not BROWSER_AVAILABLE or not driver:
         return False
     
+    warmed = _warmed_sessions.get(retailer.lower())
+    if warmed and warmed[0] is driver and time.monotonic() - warmed[1] < WARM_SESSION_TTL_SECONDS:
+        return True
+    
     retailer_urls = {
         "gamestop": {
             "homepage": "https://www.gamestop.com",
@@ -245,10 +253,11 @@ def warm_session(driver: webdriver.Chrome, retailer: str) -> bool:
                 y = random.randint(100, 600)
                 actions.move_by_offset(x, y).perform()
                 time.sleep(random.uniform(0.5, 1.5))
-        except:
+        except Exception:
             pass
         
         print(f"✅ Session warmed for {retailer}")
+        _warmed_sessions[retailer.lower()] = (driver, time.monotonic())
         return True
         
     except Exception as e:
@@ -279,9 +288,10 @@ def get_browser(headless: bool = True) -> Optional[webdriver.Chrome]:
             # Check if browser is still alive
             _browser_pool[pool_key].current_url
             return _browser_pool[pool_key]
-        except:
-            # Browser died, remove from pool
+        except Exception:
+            # Browser died, remove from pool (its warmed sessions go with it)
             _browser_pool.pop(pool_key, None)
+            _warmed_sessions.clear()
     
     # Create new browser
     try:
@@ -329,9 +339,10 @@ def close_browsers():
     for driver in _browser_pool.values():
         try:
             driver.quit()
-        except:
+        except Exception:
             pass
     _browser_pool.clear()
+    _warmed_sessions.clear()
 
 
 # =============================================================================
@@ -376,7 +387,9 @@ def scan_gamestop_browser(query: str = "pokemon cards") -> List[Product]:
         # Find product elements
         items = driver.find_elements(By.CSS_SELECTOR, ".product-tile, [data-product-tile], .product")
         
-        for item in items[:20]:
+        for item in items:
+            if len(products) >= MAX_SCRAPED_PRODUCTS:
+                break
             try:
                 # Extract product info
                 name_elem = item.find_element(By.CSS_SELECTOR, "h3, .product-title, [data-product-title]")
@@ -390,21 +403,21 @@ def scan_gamestop_browser(query: str = "pokemon cards") -> List[Product]:
                     price_elem = item.find_element(By.CSS_SELECTOR, ".price, .product-price, [data-price]")
                     price_text = ''.join(c for c in price_elem.text if c.isdigit() or c == '.')
                     price = float(price_text) if price_text else 0
-                except:
+                except Exception:
                     price = 0
                 
                 # URL
                 try:
                     link_elem = item.find_element(By.CSS_SELECTOR, "a")
                     url = link_elem.get_attribute("href")
-                except:
+                except Exception:
                     url = search_url
                 
                 # Stock check
                 try:
                     add_to_cart = item.find_element(By.CSS_SELECTOR, ".add-to-cart, button:contains('Add')")
                     in_stock = True
-                except:
+                except Exception:
                     in_stock = False
                 
                 products.append(Product(
@@ -466,7 +479,9 @@ def scan_pokemoncenter_browser(query: str = "trading cards") -> List[Product]:
         
         items = driver.find_elements(By.CSS_SELECTOR, "[data-testid='product-card'], .product-card, .product-tile")
         
-        for item in items[:20]:
+        for item in items:
+            if len(products) >= MAX_SCRAPED_PRODUCTS:
+                break
             try:
                 name_elem = item.find_element(By.CSS_SELECTOR, "h2, h3, .product-name, [data-testid='product-name']")
                 name = name_elem.text.strip()
@@ -479,14 +494,14 @@ def scan_pokemoncenter_browser(query: str = "trading cards") -> List[Product]:
                     price_elem = item.find_element(By.CSS_SELECTOR, ".price, .product-price, [data-price]")
                     price_text = ''.join(c for c in price_elem.text if c.isdigit() or c == '.')
                     price = float(price_text) if price_text else 0
-                except:
+                except Exception:
                     price = 0
                 
                 # URL
                 try:
                     link_elem = item.find_element(By.CSS_SELECTOR, "a")
                     url = link_elem.get_attribute("href")
-                except:
+                except Exception:
                     url = search_url
                 
                 # Stock - Pokemon Center shows "Add to Cart" if available
@@ -494,12 +509,12 @@ def scan_pokemoncenter_browser(query: str = "trading cards") -> List[Product]:
                     add_to_cart = item.find_element(By.CSS_SELECTOR, "button:contains('Add to Cart'), [aria-label*='Add to Cart']")
                     oos = item.find_element(By.CSS_SELECTOR, ".out-of-stock, [aria-label*='out of stock']")
                     in_stock = False  # Found OOS indicator
-                except:
+                except Exception:
                     # No OOS indicator = might be in stock
                     try:
                         item.find_element(By.CSS_SELECTOR, "button, .add-to-cart")
                         in_stock = True
-                    except:
+                    except Exception:
                         in_stock = False
                 
                 products.append(Product(
@@ -557,7 +572,9 @@ def scan_costco_browser(query: str = "pokemon trading cards") -> List[Product]:
         
         items = driver.find_elements(By.CSS_SELECTOR, "[data-automation-id='productTile'], .product-tile, .product")
         
-        for item in items[:20]:
+        for item in items:
+            if len(products) >= MAX_SCRAPED_PRODUCTS:
+                break
             try:
                 name_elem = item.find_element(By.CSS_SELECTOR, "[data-automation-id='productTitle'], .product-title a, h3 a")
                 name = name_elem.text.strip()
@@ -570,14 +587,14 @@ def scan_costco_browser(query: str = "pokemon trading cards") -> List[Product]:
                     price_elem = item.find_element(By.CSS_SELECTOR, "[data-automation-id='productPrice'], .price")
                     price_text = ''.join(c for c in price_elem.text if c.isdigit() or c == '.')
                     price = float(price_text) if price_text else 0
-                except:
+                except Exception:
                     price = 0
                 
                 # URL
                 try:
                     link_elem = item.find_element(By.CSS_SELECTOR, "a[href*='/product.']")
                     url = link_elem.get_attribute("href")
-                except:
+                except Exception:
                     url = search_url
                 
                 # Stock
@@ -585,7 +602,7 @@ def scan_costco_browser(query: str = "pokemon trading cards") -> List[Product]:
                     item.find_element(By.CSS_SELECTOR, "[data-automation-id='addToCartButton'], .add-to-cart")
                     oos = item.find_element(By.CSS_SELECTOR, ".out-of-stock")
                     in_stock = False
-                except:
+                except Exception:
                     in_stock = True
                 
                 products.append(Product(
@@ -643,7 +660,9 @@ def scan_amazon_browser(query: str = "pokemon trading cards") -> List[Product]:
         
         items = driver.find_elements(By.CSS_SELECTOR, "[data-component-type='s-search-result'], .s-result-item")
         
-        for item in items[:20]:
+        for item in items:
+            if len(products) >= MAX_SCRAPED_PRODUCTS:
+                break
             try:
                 name_elem = item.find_element(By.CSS_SELECTOR, "h2 a span, .s-title-instructions-style h2 a")
                 name = name_elem.text.strip()
@@ -656,14 +675,14 @@ def scan_amazon_browser(query: str = "pokemon trading cards") -> List[Product]:
                     price_elem = item.find_element(By.CSS_SELECTOR, ".a-price .a-offscreen, .a-price-whole")
                     price_text = ''.join(c for c in price_elem.text if c.isdigit() or c == '.')
                     price = float(price_text) if price_text else 0
-                except:
+                except Exception:
                     price = 0
                 
                 # URL
                 try:
                     link_elem = item.find_element(By.CSS_SELECTOR, "h2 a")
                     url = link_elem.get_attribute("href")
-                except:
+                except Exception:
                     url = search_url
                 
                 # Stock
@@ -671,7 +690,7 @@ def scan_amazon_browser(query: str = "pokemon trading cards") -> List[Product]:
                     item.find_element(By.CSS_SELECTOR, "[aria-label*='Add to Cart']")
                     unavailable = item.find_element(By.CSS_SELECTOR, ".a-color-state, [aria-label*='unavailable']")
                     in_stock = False
-                except:
+                except Exception:
                     in_stock = True
                 
                 products.append(Product(
@@ -729,7 +748,9 @@ def scan_barnesandnoble_browser(query: str = "pokemon trading cards") -> List[Pr
         
         items = driver.find_elements(By.CSS_SELECTOR, "[data-testid='productCard'], .product-shelf-item, .product-item")
         
-        for item in items[:20]:
+        for item in items:
+            if len(products) >= MAX_SCRAPED_PRODUCTS:
+                break
             try:
                 name_elem = item.find_element(By.CSS_SELECTOR, "[data-testid='productTitle'], .product-title a, h3 a")
                 name = name_elem.text.strip()
@@ -742,14 +763,14 @@ def scan_barnesandnoble_browser(query: str = "pokemon trading cards") -> List[Pr
                     price_elem = item.find_element(By.CSS_SELECTOR, "[data-testid='price'], .price, .product-price")
                     price_text = ''.join(c for c in price_elem.text if c.isdigit() or c == '.')
                     price = float(price_text) if price_text else 0
-                except:
+                except Exception:
                     price = 0
                 
                 # URL
                 try:
                     link_elem = item.find_element(By.CSS_SELECTOR, "a[href*='/p/']")
                     url = link_elem.get_attribute("href")
-                except:
+                except Exception:
                     url = search_url
                 
                 # Stock
@@ -757,7 +778,7 @@ def scan_barnesandnoble_browser(query: str = "pokemon trading cards") -> List[Pr
                     item.find_element(By.CSS_SELECTOR, "[data-testid='addToCart'], .add-to-cart-button")
                     oos = item.find_element(By.CSS_SELECTOR, ".out-of-stock")
                     in_stock = False
-                except:
+                except Exception:
                     in_stock = True
                 
                 products.append(Product(
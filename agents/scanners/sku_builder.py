@@ -17,8 +17,8 @@ import hashlib
 from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
-from dataclasses import dataclass, asdict
-from collections import defaultdict
+from dataclasses import dataclass
+from collections import Counter, defaultdict
 
 try:
     import requests
@@ -68,7 +68,9 @@ class SKUEntry:
     confidence: float = 0.5  # 0-1, how confident we are this is correct
     
     def to_dict(self):
-        return asdict(self)
+        # Scalar fields only: a shallow copy is what asdict() would return,
+        # minus the per-field deepcopy (runs for every SKU on each save).
+        return dict(self.__dict__)
     
     @classmethod
     def from_dict(cls, data: dict):
@@ -118,6 +120,21 @@ class SKUDatabase:
         Returns:
             True if added (new or updated), False if duplicate
         """
+        return self._merge(entry, datetime.now().isoformat())
+    
+    def add_many(self, entries: List[SKUEntry], dedupe: bool = True) -> int:
+        """
+        Add a batch of SKUs with deduplication, sharing one timestamp.
+        
+        Returns:
+            Number of entries added (new or updated)
+        """
+        now = datetime.now().isoformat()
+        merge = self._merge
+        return sum(1 for entry in entries if merge(entry, now))
+    
+    def _merge(self, entry: SKUEntry, now: str) -> bool:
+        """Merge one entry into the database, stamping changes with now."""
         key = self._make_key(entry.retailer, entry.sku)
         
         if key in self.skus:
@@ -131,14 +148,14 @@ class SKUDatabase:
                 existing.price = entry.price or existing.price
                 existing.url = entry.url or existing.url
                 existing.image_url = entry.image_url or existing.image_url
-                existing.last_updated = datetime.now().isoformat()
+                existing.last_updated = now
                 existing.confidence = max(existing.confidence, entry.confidence)
                 return True
             return False  # Duplicate, no update needed
         else:
             # New SKU
-            entry.first_seen = datetime.now().isoformat()
-            entry.last_updated = datetime.now().isoformat()
+            entry.first_seen = now
+            entry.last_updated = now
             self.skus[key] = entry
             return True
     
@@ -166,6 +183,31 @@ class SKUDatabase:
 # CATEGORIZATION
 # =============================================================================
 
+# Known set names, checked in order; the first hit wins.
+_KNOWN_SETS = tuple((s, s.title()) for s in (
+    "151", "paldean fates", "obsidian flames", "paradox rift",
+    "temporal forces", "stellar crown", "surging sparks",
+    "prismatic evolutions", "destined rivals", "shrouded fable",
+    "ancient roar", "future flash", "twilight masquerade",
+))
+
+# (keywords, category) in priority order; the first rule with a keyword hit wins.
+_CATEGORY_RULES = (
+    (("booster box", "36 pack"), "booster_box"),
+    (("elite trainer box", "etb"), "etb"),
+    (("booster bundle", "6 pack"), "booster_bundle"),
+    (("booster pack",), "booster_pack"),  # Only when "box" is not in the name
+    (("collection box", "collection"), "collection_box"),
+    (("tin",), "tin"),
+    (("binder",), "binder"),
+    (("sleeves",), "sleeves"),
+    (("deck box",), "deck_box"),
+    (("playmat",), "playmat"),
+    (("single", "card"), "single_card"),
+    (("premium collection",), "premium_collection"),
+)
+
+
 def categorize_product(name: str, set_name: Optional[str] = None) -> Tuple[str, Optional[str]]:
     """
     Categorize a product based on name and set.
@@ -175,51 +217,22 @@ def categorize_product(name: str, set_name: Optional[str] = None) -> Tuple[str,
     """
     name_lower = name.lower()
     
-    # Detect set names
-    detected_set = None
-    known_sets = [
-        "151", "paldean fates", "obsidian flames", "paradox rift",
-        "temporal forces", "stellar crown", "surging sparks",
-        "prismatic evolutions", "destined rivals", "shrouded fable",
-        "ancient roar", "future flash", "twilight masquerade",
-    ]
-    
-    for set_name_check in known_sets:
-        if set_name_check in name_lower:
-            detected_set = set_name_check.title()
-            break
-    
-    # Use provided set name if available
-    if set_name:
-        detected_set = set_name
+    # Use provided set name if available, otherwise detect it
+    detected_set = set_name or None
+    if detected_set is None:
+        for set_name_check, title in _KNOWN_SETS:
+            if set_name_check in name_lower:
+                detected_set = title
+                break
     
     # Categorize by product type
-    if "booster box" in name_lower or "36 pack" in name_lower:
-        return ("booster_box", detected_set)
-    elif "elite trainer box" in name_lower or "etb" in name_lower:
-        return ("etb", detected_set)
-    elif "booster bundle" in name_lower or "6 pack" in name_lower:
-        return ("booster_bundle", detected_set)
-    elif "booster pack" in name_lower and "box" not in name_lower:
-        return ("booster_pack", detected_set)
-    elif "collection box" in name_lower or "collection" in name_lower:
-        return ("collection_box", detected_set)
-    elif "tin" in name_lower:
-        return ("tin", detected_set)
-    elif "binder" in name_lower:
-        return ("binder", detected_set)
-    elif "sleeves" in name_lower:
-        return ("sleeves", detected_set)
-    elif "deck box" in name_lower:
-        return ("deck_box", detected_set)
-    elif "playmat" in name_lower:
-        return ("playmat", detected_set)
-    elif "single" in name_lower or "card" in name_lower:
-        return ("single_card", detected_set)
-    elif "premium collection" in name_lower:
-        return ("premium_collection", detected_set)
-    else:
-        return ("other", detected_set)
+    for keywords, category in _CATEGORY_RULES:
+        for keyword in keywords:
+            if keyword in name_lower:
+                if category == "booster_pack" and "box" in name_lower:
+                    break
+                return (category, detected_set)
+    return ("other", detected_set)
 
 
 # =============================================================================
@@ -507,13 +520,11 @@ def build_sku_list_daily(retailers: List[str] = None, force: bool = False):
         time.sleep(get_random_delay())
     
     # Deduplicate and add to database
-    added_count = 0
-    for entry in all_entries:
-        if db.add_sku(entry, dedupe=True):
-            added_count += 1
+    added_count = db.add_many(all_entries, dedupe=True)
     
-    # Save database
-    db.save()
+    # Save database (skip the rewrite when nothing changed)
+    if added_count:
+        db.save()
     
     # Mark as run
     last_run_file = SKU_DB_FILE.parent / "sku_build_last_run.txt"
@@ -526,8 +537,7 @@ def build_sku_list_daily(retailers: List[str] = None, force: bool = False):
         "total_skus": len(db.skus),
         "new_skus": added_count,
         "by_retailer": {r: len(db.get_by_retailer(r)) for r in retailers},
-        "by_category": {c: len([e for e in db.skus.values() if e.category == c]) 
-                       for c in set(e.category for e in db.skus.values())},
+        "by_category": dict(Counter(e.category for e in db.skus.values())),
     }
 
 
@@ -546,15 +556,21 @@ def get_sku_stats() -> Dict:
         "by_set": {},
     }
     
+    entries = db.skus.values()
+    
+    # One pass per breakdown instead of a full get_by_* scan per key
+    retailer_counts = Counter(e.retailer.lower() for e in entries)
     for retailer in ["target", "bestbuy", "gamestop", "pokemoncenter"]:
-        stats["by_retailer"][retailer] = len(db.get_by_retailer(retailer))
+        stats["by_retailer"][retailer] = retailer_counts.get(retailer, 0)
     
-    categories = set(e.category for e in db.skus.values())
-    for category in categories:
-        stats["by_category"][category] = len(db.get_by_category(category))
+    stats["by_category"] = dict(Counter(e.category for e in entries))
     
-    sets = set(e.set_name for e in db.skus.values() if e.set_name)
-    for set_name in sets:
-        stats["by_set"][set_name] = len(db.get_by_set(set_name))
+    # get_by_set matches by substring, so counts still compare every entry,
+    # but names are lowered once and dict.fromkeys keeps first-seen order
+    set_names = dict.fromkeys(e.set_name for e in entries if e.set_name)
+    lowered = [e.set_name.lower() for e in entries if e.set_name]
+    for set_name in set_names:
+        set_lower = set_name.lower()
+        stats["by_set"][set_name] = sum(1 for name in lowered if set_lower in name)
     
     return stats
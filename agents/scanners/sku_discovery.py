@@ -26,7 +26,7 @@ try:
 except ImportError:
     BS4_AVAILABLE = False
 
-from agents.scanners.stock_checker import Product
+from agents.scanners.stock_checker import Product, parse_price, get_session
 try:
     from agents.stealth.anti_detect import get_stealth_headers, get_random_delay, get_random_proxy
 except ImportError:
@@ -73,7 +73,7 @@ def lookup_by_sku_target(tcin: str, zip_code: str = "90210") -> Optional[Product
         headers["Accept"] = "application/json"
         
         time.sleep(get_random_delay())
-        resp = requests.get(api_url, params=params, headers=headers, timeout=15)
+        resp = get_session("target").get(api_url, params=params, headers=headers, timeout=15)
         
         if resp.status_code == 200:
             data = resp.json()
@@ -151,7 +151,7 @@ def lookup_by_sku_bestbuy(sku: str) -> Optional[Product]:
         }
         
         time.sleep(get_random_delay())
-        resp = requests.get(url, params=params, timeout=15)
+        resp = get_session("bestbuy").get(url, params=params, timeout=15)
         
         if resp.status_code == 200:
             item = resp.json()
@@ -193,7 +193,7 @@ def _scrape_bestbuy_sku(sku: str) -> Optional[Product]:
         proxies = get_random_proxy()
         
         time.sleep(get_random_delay())
-        resp = requests.get(url, headers=headers, proxies=proxies, timeout=15)
+        resp = get_session("bestbuy").get(url, headers=headers, proxies=proxies, timeout=15)
         
         if resp.status_code == 200:
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -208,13 +208,7 @@ def _scrape_bestbuy_sku(sku: str) -> Optional[Product]:
             
             name = name_elem.get_text(strip=True)
             
-            price = 0
-            if price_elem:
-                price_text = ''.join(c for c in price_elem.get_text() if c.isdigit() or c == '.')
-                try:
-                    price = float(price_text) if price_text else 0
-                except:
-                    pass
+            price = parse_price(price_elem.get_text()) if price_elem else 0
             
             # Check stock
             stock_text = stock_elem.get_text(strip=True).lower() if stock_elem else ""
@@ -260,7 +254,7 @@ def lookup_by_sku_gamestop(sku: str) -> Optional[Product]:
         proxies = get_random_proxy()
         
         time.sleep(get_random_delay())
-        resp = requests.get(url, headers=headers, proxies=proxies, timeout=15)
+        resp = get_session("gamestop").get(url, headers=headers, proxies=proxies, timeout=15)
         
         if resp.status_code == 200:
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -274,13 +268,7 @@ def lookup_by_sku_gamestop(sku: str) -> Optional[Product]:
             
             name = name_elem.get_text(strip=True)
             
-            price = 0
-            if price_elem:
-                price_text = ''.join(c for c in price_elem.get_text() if c.isdigit() or c == '.')
-                try:
-                    price = float(price_text) if price_text else 0
-                except:
-                    pass
+            price = parse_price(price_elem.get_text()) if price_elem else 0
             
             in_stock = stock_elem is not None and 'unavailable' not in (stock_elem.get_text() or '').lower()
             
@@ -323,7 +311,7 @@ def lookup_by_sku_pokemoncenter(product_id: str) -> Optional[Product]:
         proxies = get_random_proxy()
         
         time.sleep(get_random_delay())
-        resp = requests.get(url, headers=headers, proxies=proxies, timeout=15)
+        resp = get_session("pokemoncenter").get(url, headers=headers, proxies=proxies, timeout=15)
         
         if resp.status_code == 200:
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -338,13 +326,7 @@ def lookup_by_sku_pokemoncenter(product_id: str) -> Optional[Product]:
             
             name = name_elem.get_text(strip=True)
             
-            price = 0
-            if price_elem:
-                price_text = ''.join(c for c in price_elem.get_text() if c.isdigit() or c == '.')
-                try:
-                    price = float(price_text) if price_text else 0
-                except:
-                    pass
+            price = parse_price(price_elem.get_text()) if price_elem else 0
             
             # Multiple indicators for stock
             in_stock = stock_elem is None and add_to_cart is not None
@@ -394,7 +376,7 @@ def lookup_by_sku_walmart(sku: str) -> Optional[Product]:
         proxies = get_random_proxy()
         
         time.sleep(get_random_delay())
-        resp = requests.get(url, headers=headers, proxies=proxies, timeout=15)
+        resp = get_session("walmart").get(url, headers=headers, proxies=proxies, timeout=15)
         
         if resp.status_code == 200:
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -408,13 +390,7 @@ def lookup_by_sku_walmart(sku: str) -> Optional[Product]:
             
             name = name_elem.get_text(strip=True)
             
-            price = 0
-            if price_elem:
-                price_text = ''.join(c for c in price_elem.get_text() if c.isdigit() or c == '.')
-                try:
-                    price = float(price_text) if price_text else 0
-                except:
-                    pass
+            price = parse_price(price_elem.get_text()) if price_elem else 0
             
             in_stock = stock_elem is not None and 'disabled' not in (stock_elem.get('class', []) or [])
             
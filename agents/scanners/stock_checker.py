@@ -18,29 +18,72 @@ import json
 import os
 import sys
 import time
+import re
 import random
 import hashlib
+import sqlite3
+import threading
 import html as _html
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import MISSING, dataclass, fields
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from importlib.util import find_spec
+from operator import itemgetter
 
 sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
 
 try:
     import requests
     from requests.adapters import HTTPAdapter
+    from urllib3.util import make_headers
     from urllib3.util.retry import Retry
+    # Only advertise encodings urllib3 can decode here: br and zstd are
+    # added when brotli / zstandard are installed.
+    ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
 except ImportError:
     requests = None
+    ACCEPT_ENCODING = "gzip, deflate"
 
 try:
-    from bs4 import BeautifulSoup
-    BS4_AVAILABLE = True
+    import httpx
+    import h2  # noqa: F401 - required by httpx for http2=True
+    HTTP2_AVAILABLE = True
 except ImportError:
-    BS4_AVAILABLE = False
+    HTTP2_AVAILABLE = False
+
+# bs4 is only used by the scrape fallbacks: probe for it here and import it
+# on first use (_bs4/_css) so API-only scans never load it.
+BS4_AVAILABLE = find_spec("bs4") is not None
+
+# lxml's C parser is far faster than the pure-Python html.parser
+LXML_AVAILABLE = find_spec("lxml") is not None
+BS4_PARSER = "lxml" if LXML_AVAILABLE else "html.parser"
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Fuzzy fallback for relevance matching (typos, plural/singular drift)
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Hot-path JSON codec: orjson parses response bytes directly and is several
+# times faster; json.loads also accepts bytes, so either output round-trips.
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 # =============================================================================
 # CONFIGURATION
@@ -48,6 +91,7 @@ except ImportError:
 
 CACHE_DIR = Path(__file__).parent.parent.parent / ".stock_cache"
 CACHE_DIR.mkdir(exist_ok=True)
+CACHE_DB_PATH = CACHE_DIR / "cache.db"
 CACHE_TTL_SECONDS = 180  # 3 minute cache for better performance
 
 # Pokemon TCG API Key (get free key at https://dev.pokemontcg.io)
@@ -61,12 +105,35 @@ MAX_DELAY = 0.15 if FAST_MODE else 1.0
 
 # Parallel scanning config
 MAX_WORKERS = 6  # Scan up to 6 retailers simultaneously
+# Scans served at once (Flask request threads); the shared scan pool holds
+# MAX_WORKERS threads for each so concurrent scans never queue behind each other
+MAX_CONCURRENT_SCANS = int(os.environ.get("MAX_CONCURRENT_SCANS", "4"))
 REQUEST_TIMEOUT = 12  # Seconds
+MAX_SCRAPED_PRODUCTS = 20  # Stop parsing once this many products matched
 
 # Retry configuration
 MAX_RETRIES = 2
 RETRY_BACKOFF = 0.5  # Seconds between retries
 
+# Connection pool sizing - each retailer session talks to a single host
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE_DEFAULT = 16
+POOL_MAXSIZE_BY_RETAILER = {
+    "target": 32,   # Concurrent store lookup + fulfillment batches
+    "walmart": 32,
+    "bestbuy": 8,
+    "gamestop": 8,
+}
+
+# The structured logger needs the repo root on sys.path (the server has
+# it); run as a script, errors still reach stderr via stdlib logging.
+try:
+    from agents.utils.logger import get_logger
+    logger = get_logger("stock_checker")
+except ImportError:
+    import logging
+    logger = logging.getLogger("stock_checker")
+
 # Stealth utilities
 try:
     from stealth.anti_detect import get_stealth_headers, get_random_delay
@@ -78,17 +145,20 @@ except ImportError:
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:123.0) Gecko/20100101 Firefox/123.0",
     ]
+    # Only the User-Agent rotates; the rest is copied from one constant
+    _BASE_STEALTH_HEADERS = {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.5",
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "Connection": "keep-alive",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "none",
+    }
     def get_stealth_headers():
-        return {
-            "User-Agent": random.choice(USER_AGENTS),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-        }
+        headers = _BASE_STEALTH_HEADERS.copy()
+        headers["User-Agent"] = random.choice(USER_AGENTS)
+        return headers
     def get_random_delay():
         return random.uniform(MIN_DELAY, MAX_DELAY)
 
@@ -99,25 +169,37 @@ except ImportError:
 
 _session_pool: Dict[str, requests.Session] = {}
 
-def get_session(retailer: str = "default") -> requests.Session:
+# Retry never mutates itself (increment() returns a copy), so one instance
+# is shared by every retailer adapter instead of being rebuilt per session.
+_RETRY_STRATEGY = Retry(
+    total=MAX_RETRIES,
+    backoff_factor=RETRY_BACKOFF,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(("GET", "POST")),
+)
+
+def get_session(retailer: str = "default", pool_maxsize: int = None) -> requests.Session:
     """Get or create a session with retry logic for a retailer."""
     global _session_pool
     
     if retailer not in _session_pool:
-        session = requests.Session()
+        if pool_maxsize is None:
+            pool_maxsize = POOL_MAXSIZE_BY_RETAILER.get(retailer, POOL_MAXSIZE_DEFAULT)
         
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=MAX_RETRIES,
-            backoff_factor=RETRY_BACKOFF,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"],
-        )
+        session = requests.Session()
+        # Session-level defaults: calls that pass no headers of their own
+        # (Best Buy API, SKU lookups) no longer go out as python-requests,
+        # and per-call stealth headers still override these.
+        session.headers.update({
+            "User-Agent": get_stealth_headers().get("User-Agent", session.headers["User-Agent"]),
+            "Accept-Language": "en-US,en;q=0.5",
+        })
         
         adapter = HTTPAdapter(
-            max_retries=retry_strategy,
-            pool_connections=10,
-            pool_maxsize=20,
+            max_retries=_RETRY_STRATEGY,
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize,
+            pool_block=False,
         )
         
         session.mount("http://", adapter)
@@ -128,12 +210,133 @@ def get_session(retailer: str = "default") -> requests.Session:
     return _session_pool[retailer]
 
 
+RETRY_STATUS_CODES = frozenset((429, 500, 502, 503, 504))  # Same as _RETRY_STRATEGY
+
+
+if HTTP2_AVAILABLE:
+    class _StatusRetryTransport(httpx.BaseTransport):
+        """
+        Retry 429/5xx responses with backoff, as _RETRY_STRATEGY does for
+        the requests sessions.
+        
+        httpx's own retries= only covers connection failures, so without
+        this the Target client would give up on the first 429 or 503.
+        """
+        
+        def __init__(self, transport: "httpx.BaseTransport"):
+            self._transport = transport
+        
+        def handle_request(self, request: "httpx.Request") -> "httpx.Response":
+            for attempt in range(MAX_RETRIES + 1):
+                response = self._transport.handle_request(request)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                    return response
+                
+                # Honour a numeric Retry-After (capped), else exponential backoff
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = min(float(retry_after), REQUEST_TIMEOUT)
+                else:
+                    delay = RETRY_BACKOFF * (2 ** attempt)
+                response.close()
+                time.sleep(delay)
+            return response
+        
+        def close(self):
+            self._transport.close()
+
+
+_target_client = None
+_target_client_lock = threading.Lock()
+
+def get_target_client():
+    """
+    Get the client for redsky.target.com.
+    
+    Every Target call hits the same host, so with HTTP/2 available the store
+    lookup, search and fulfillment requests multiplex over one connection,
+    retrying 429/5xx like the requests sessions. Falls back to the pooled
+    requests session otherwise.
+    """
+    global _target_client
+    
+    if not HTTP2_AVAILABLE:
+        return get_session("target")
+    
+    if _target_client is None:
+        with _target_client_lock:
+            if _target_client is None:
+                _target_client = httpx.Client(transport=_StatusRetryTransport(httpx.HTTPTransport(
+                    http2=True,
+                    retries=MAX_RETRIES,  # Connection failures
+                    limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=30),
+                )))
+    
+    return _target_client
+
+
+# One long-lived pool for retailer scans: repeat scan_all/scan_multiple calls
+# reuse warm threads (and their thread-local state) instead of spawning and
+# joining a fresh pool every request. Every scan submits at most one task per
+# retailer (<= MAX_WORKERS, the width a per-call pool of len(retailers) had),
+# so sizing for MAX_CONCURRENT_SCANS keeps concurrent requests running side by
+# side. Threads are only started when no idle one exists, so the headroom
+# costs nothing at low load.
+_scan_executor = ThreadPoolExecutor(
+    max_workers=MAX_WORKERS * MAX_CONCURRENT_SCANS,
+    thread_name_prefix="stock-scan",
+)
+
+# Target store lookups overlap the search request. They get their own small
+# pool (one slot per concurrent scan) rather than _scan_executor, so a scan
+# worker waiting on its lookup can never starve the pool it runs in.
+_target_store_executor = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_SCANS,
+    thread_name_prefix="target-store",
+)
+
+
 def close_sessions():
     """Close all sessions (call on shutdown)."""
-    global _session_pool
+    global _session_pool, _target_client
     for session in _session_pool.values():
         session.close()
     _session_pool = {}
+    
+    if _target_client is not None:
+        _target_client.close()
+        _target_client = None
+
+
+# =============================================================================
+# HOST RATE LIMITER - Per-host pacing
+# =============================================================================
+
+class HostRateLimiter:
+    """
+    Per-host request pacing shared by all scanner threads.
+    
+    Each host keeps its own next-allowed time, so parallel scans of different
+    retailers never wait on each other, while consecutive requests to the same
+    host stay at least one get_random_delay() apart.
+    """
+    
+    def __init__(self, interval_fn=None):
+        self._interval_fn = interval_fn or get_random_delay
+        self._next_allowed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, host: str):
+        """Block until host's next request slot, then reserve the one after it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, 0.0))
+            self._next_allowed[host] = slot + self._interval_fn()
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_host_limiter = HostRateLimiter()
 
 
 @dataclass
@@ -154,58 +357,311 @@ class Product:
     detection_method: str = ""
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # All fields are scalars, so a shallow copy matches asdict() without
+        # its recursive deepcopy walk.
+        return dict(self.__dict__)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Product":
+        """Rebuild a Product from a cached dict without kwargs expansion."""
+        product = cls.__new__(cls)
+        # Defaults first, so entries missing newer fields still get them
+        product.__dict__ = dict(_PRODUCT_DEFAULTS)
+        product.__dict__.update(data)
+        return product
+
+
+_PRODUCT_DEFAULTS = {
+    f.name: f.default for f in fields(Product) if f.default is not MISSING
+}
 
 
 # =============================================================================
 # CACHE - With TTL Support
 # =============================================================================
 
+_cache_db: Optional[sqlite3.Connection] = None
+_cache_db_lock = threading.Lock()
+
+# Process-local LRU in front of SQLite: key -> (retailer, ts, serialized payload).
+# Repeat scans of the same retailer/query never touch the database. Entries
+# hold the persisted JSON, not live objects, so every hit decodes a fresh
+# copy and callers can't mutate what later readers see.
+CACHE_MEM_MAX_ENTRIES = 256
+_cache_mem: "OrderedDict[str, Tuple[str, float, Any]]" = OrderedDict()
+_cache_mem_lock = threading.Lock()
+
+def _cache_mem_put(key: str, retailer: str, ts: float, data: Any):
+    with _cache_mem_lock:
+        _cache_mem[key] = (retailer, ts, data)
+        _cache_mem.move_to_end(key)
+        while len(_cache_mem) > CACHE_MEM_MAX_ENTRIES:
+            _cache_mem.popitem(last=False)
+
+# Single writer thread: scanners return without waiting on SQLite, and
+# writes (and clears) apply in submission order.
+_cache_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stock-cache")
+
+def _get_cache_db() -> sqlite3.Connection:
+    """Open (once) the single SQLite file backing Cache."""
+    global _cache_db
+    
+    if _cache_db is None:
+        db = sqlite3.connect(str(CACHE_DB_PATH), check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                retailer TEXT NOT NULL,
+                ts REAL NOT NULL,
+                payload TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )
+        """)
+        # Databases created before HTTP validators were stored
+        columns = {row[1] for row in db.execute("PRAGMA table_info(cache)")}
+        for column in ("etag", "last_modified"):
+            if column not in columns:
+                db.execute(f"ALTER TABLE cache ADD COLUMN {column} TEXT")
+        db.execute("CREATE INDEX IF NOT EXISTS idx_cache_retailer ON cache(retailer)")
+        _cache_db = db
+    
+    return _cache_db
+
+
 class Cache:
     @staticmethod
+    @lru_cache(maxsize=512)
     def key(retailer: str, query: str = "") -> str:
         return hashlib.md5(f"{retailer}_{query}".lower().encode()).hexdigest()
     
     @staticmethod
     def get(retailer: str, query: str = "", ttl_override: int = None) -> Optional[List[Dict]]:
         """Get cached data if not expired."""
-        cache_file = CACHE_DIR / f"{Cache.key(retailer, query)}.json"
-        if not cache_file.exists():
+        ttl = ttl_override if ttl_override is not None else CACHE_TTL_SECONDS
+        key = Cache.key(retailer, query)
+        now = time.time()
+        
+        with _cache_mem_lock:
+            entry = _cache_mem.get(key)
+            if entry is not None and now - entry[1] <= ttl:
+                _cache_mem.move_to_end(key)
+                payload = entry[2]
+            else:
+                payload = None
+        if payload is not None:
+            return _json_loads(payload)
+        
+        try:
+            with _cache_db_lock:
+                row = _get_cache_db().execute(
+                    "SELECT ts, payload FROM cache WHERE key = ?", (key,),
+                ).fetchone()
+            # Rule out stale entries before paying for the JSON parse
+            if row is None or now - row[0] > ttl:
+                return None
+            data = _json_loads(row[1])
+        except Exception:
             return None
+        
+        _cache_mem_put(key, retailer.lower(), row[0], row[1])
+        return data
+    
+    @staticmethod
+    def set(retailer: str, query: str, products: List[Dict], etag: str = None, last_modified: str = None):
+        """Cache products with timestamp (written in the background)."""
+        try:
+            # Serialize on the caller's thread so later mutation can't leak in
+            payload = _json_dumps(products)
+            key = Cache.key(retailer, query)
+            ts = time.time()
+            _cache_mem_put(key, retailer.lower(), ts, payload)
+            _cache_writer.submit(Cache._write, key, retailer.lower(), ts, payload, etag, last_modified)
+        except Exception:
+            pass
+    
+    @staticmethod
+    def _write(key: str, retailer: str, ts: float, payload, etag: str = None, last_modified: str = None):
+        """Persist one serialized entry (runs on the cache writer thread)."""
+        try:
+            with _cache_db_lock:
+                _get_cache_db().execute(
+                    "INSERT OR REPLACE INTO cache (key, retailer, ts, payload, etag, last_modified) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, retailer, ts, payload, etag, last_modified),
+                )
+        except Exception:
+            pass
+    
+    @staticmethod
+    def validators(retailer: str, query: str = "") -> Dict[str, str]:
+        """
+        Conditional request headers for a cached entry, even an expired one.
+        
+        Sending these lets the retailer answer 304 Not Modified instead of
+        re-sending a body we already have (see revalidated_products).
+        """
+        try:
+            with _cache_db_lock:
+                row = _get_cache_db().execute(
+                    "SELECT etag, last_modified FROM cache WHERE key = ?",
+                    (Cache.key(retailer, query),),
+                ).fetchone()
+        except Exception:
+            return {}
+        
+        headers = {}
+        if row and row[0]:
+            headers["If-None-Match"] = row[0]
+        if row and row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+    
+    @staticmethod
+    def revalidated_products(retailer: str, query: str = "", last_checked: str = None) -> Optional[List[Product]]:
+        """
+        Return the cached products after a 304 and restart their TTL.
+        
+        Unlike get_products this ignores expiry: the retailer just confirmed
+        the stored response is still current.
+        """
+        key = Cache.key(retailer, query)
         try:
-            with open(cache_file) as f:
-                data = json.load(f)
-            ttl = ttl_override if ttl_override is not None else CACHE_TTL_SECONDS
-            if datetime.now() - datetime.fromisoformat(data["ts"]) > timedelta(seconds=ttl):
+            with _cache_db_lock:
+                row = _get_cache_db().execute(
+                    "SELECT payload FROM cache WHERE key = ?", (key,),
+                ).fetchone()
+            if row is None:
                 return None
-            return data["products"]
+            data = _json_loads(row[0])
+            products = [Product.from_dict(p) for p in data]
         except Exception:
             return None
+        
+        ts = time.time()
+        _cache_mem_put(key, retailer.lower(), ts, row[0])
+        _cache_writer.submit(Cache._touch, key, ts)
+        if last_checked:
+            for p in products:
+                p.last_checked = last_checked
+        return products
     
     @staticmethod
-    def set(retailer: str, query: str, products: List[Dict]):
-        """Cache products with timestamp."""
-        cache_file = CACHE_DIR / f"{Cache.key(retailer, query)}.json"
+    def _touch(key: str, ts: float):
         try:
-            with open(cache_file, "w") as f:
-                json.dump({"ts": datetime.now().isoformat(), "products": products}, f)
+            with _cache_db_lock:
+                _get_cache_db().execute("UPDATE cache SET ts = ? WHERE key = ?", (ts, key))
         except Exception:
             pass
     
+    @staticmethod
+    def get_products(retailer: str, query: str = "", ttl_override: int = None) -> Optional[List[Product]]:
+        """Get cached products as Product objects (None on miss or expiry)."""
+        cached = Cache.get(retailer, query, ttl_override)
+        if not cached:
+            return None
+        return [Product.from_dict(p) for p in cached]
+    
+    @staticmethod
+    def set_products(retailer: str, query: str, products: List[Product], response=None):
+        """Cache Product objects, keeping the response's validators if given."""
+        etag = last_modified = None
+        if response is not None:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+        Cache.set(retailer, query, [p.to_dict() for p in products], etag, last_modified)
+    
     @staticmethod
     def clear(retailer: str = None):
         """Clear cache for retailer or all."""
-        try:
+        with _cache_mem_lock:
             if retailer:
-                for f in CACHE_DIR.glob(f"*{retailer}*.json"):
-                    f.unlink()
+                name = retailer.lower().replace(" ", "")
+                for key in [k for k, entry in _cache_mem.items() if entry[0] == name]:
+                    del _cache_mem[key]
             else:
+                _cache_mem.clear()
+        
+        # Queue behind pending writes so nothing lands after the clear
+        _cache_writer.submit(Cache._clear, retailer).result()
+    
+    @staticmethod
+    def _clear(retailer: str = None):
+        try:
+            with _cache_db_lock:
+                if retailer:
+                    _get_cache_db().execute(
+                        "DELETE FROM cache WHERE retailer = ?",
+                        (retailer.lower().replace(" ", ""),),
+                    )
+                else:
+                    _get_cache_db().execute("DELETE FROM cache")
+            
+            if not retailer:
+                # Per-query JSON files from the previous on-disk layout
                 for f in CACHE_DIR.glob("*.json"):
                     f.unlink()
         except Exception:
             pass
 
 
+# =============================================================================
+# PARSING HELPERS
+# =============================================================================
+
+@lru_cache(maxsize=None)
+def _bs4():
+    """Import bs4 on first use (callers check BS4_AVAILABLE)."""
+    import bs4
+    return bs4
+
+
+@lru_cache(maxsize=None)
+def _css(selector: str):
+    """Compile a CSS selector once with soupsieve (bs4's selector engine)."""
+    import soupsieve
+    return soupsieve.compile(selector)
+
+
+@lru_cache(maxsize=None)
+def _lxml_html():
+    """Import lxml.html on first use (callers check LXML_AVAILABLE)."""
+    import lxml.html
+    return lxml.html
+
+
+@lru_cache(maxsize=None)
+def _xpath(expr: str):
+    """Compile an XPath expression once with lxml."""
+    from lxml import etree
+    return etree.XPath(expr)
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate equivalent to the CSS class selector .name"""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+def _text_strip(element) -> str:
+    """lxml equivalent of bs4's get_text(strip=True)."""
+    return "".join(t.strip() for t in element.itertext())
+
+
+# Title pre-filter: one case-insensitive scan covers both spellings
+_POKEMON_RE = re.compile(r'pok[eé]mon', re.IGNORECASE)
+
+
+# First number in the text, allowing thousands separators ("$1,299.99")
+_PRICE_RE = re.compile(r'\d[\d,]*(?:\.\d+)?')
+
+def parse_price(text: str) -> float:
+    """Parse the first price in text (0.0 if none); ranges yield the low end."""
+    m = _PRICE_RE.search(text or "")
+    return float(m.group().replace(",", "")) if m else 0.0
+
+
 # =============================================================================
 # TARGET - REDSKY API (WORKING)
 # =============================================================================
@@ -216,6 +672,7 @@ TARGET_BASE_URL = "https://redsky.target.com/redsky_aggregations/v1/web"
 # Cache store lookups (zip -> store_id) to avoid extra calls.
 _target_store_cache: Dict[str, Tuple[str, float]] = {}
 TARGET_STORE_CACHE_TTL_SECONDS = 60 * 60  # 1 hour
+TARGET_FULFILLMENT_BATCH_SIZE = 24  # tcins per product_summary_with_fulfillment call
 
 
 def _target_get_store_id(zip_code: str, session) -> Optional[str]:
@@ -227,11 +684,17 @@ def _target_get_store_id(zip_code: str, session) -> Optional[str]:
     cached = _target_store_cache.get(zip_code)
     if cached and (time.time() - cached[1]) < TARGET_STORE_CACHE_TTL_SECONDS:
         return cached[0]
+    
+    # Store lookups persist in Cache so a restart doesn't re-hit RedSky
+    stored = Cache.get("target_store", zip_code, ttl_override=TARGET_STORE_CACHE_TTL_SECONDS)
+    if stored:
+        return stored
 
     try:
         url = f"{TARGET_BASE_URL}/nearby_stores_v1"
         headers = get_stealth_headers()
         headers["Accept"] = "application/json"
+        _host_limiter.acquire("target")
         resp = session.get(
             url,
             params={"key": TARGET_REDSKY_KEY, "place": zip_code},
@@ -241,7 +704,7 @@ def _target_get_store_id(zip_code: str, session) -> Optional[str]:
         if resp.status_code != 200:
             return None
 
-        stores = (resp.json().get("data", {}) or {}).get("nearby_stores", {}).get("stores", []) or []
+        stores = (_json_loads(resp.content).get("data", {}) or {}).get("nearby_stores", {}).get("stores", []) or []
         if not stores:
             return None
 
@@ -250,6 +713,7 @@ def _target_get_store_id(zip_code: str, session) -> Optional[str]:
             return None
 
         _target_store_cache[zip_code] = (store_id, time.time())
+        Cache.set("target_store", zip_code, store_id)
         return store_id
     except Exception:
         return None
@@ -262,11 +726,45 @@ def _target_fetch_fulfillment(
     zip_code: str,
     session,
 ) -> Dict[str, Dict[str, Any]]:
-    """Fetch fulfillment (ship/pickup) status for up to ~24 tcins in one request."""
+    """
+    Fetch fulfillment (ship/pickup) status for any number of tcins.
+    
+    RedSky accepts ~24 tcins per request, so larger lists are split into
+    batches fetched concurrently over the pooled session and merged.
+    """
     tcins = [str(t).strip() for t in (tcins or []) if str(t).strip()]
     if not tcins:
         return {}
 
+    batches = [
+        tcins[i:i + TARGET_FULFILLMENT_BATCH_SIZE]
+        for i in range(0, len(tcins), TARGET_FULFILLMENT_BATCH_SIZE)
+    ]
+    if len(batches) == 1:
+        return _target_fetch_fulfillment_batch(batches[0], store_id=store_id, zip_code=zip_code, session=session)
+
+    out: Dict[str, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=min(4, len(batches))) as executor:
+        futures = [
+            executor.submit(
+                _target_fetch_fulfillment_batch, batch,
+                store_id=store_id, zip_code=zip_code, session=session,
+            )
+            for batch in batches
+        ]
+        for future in as_completed(futures):
+            out.update(future.result())
+    return out
+
+
+def _target_fetch_fulfillment_batch(
+    tcins: List[str],
+    *,
+    store_id: str,
+    zip_code: str,
+    session,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch fulfillment status for one batch of tcins in one request."""
     try:
         url = f"{TARGET_BASE_URL}/product_summary_with_fulfillment_v1"
         headers = get_stealth_headers()
@@ -287,7 +785,7 @@ def _target_fetch_fulfillment(
         if resp.status_code not in (200, 206):
             return {}
 
-        payload = resp.json()
+        payload = _json_loads(resp.content)
         summaries = (payload.get("data", {}) or {}).get("product_summaries", []) or []
 
         out: Dict[str, Dict[str, Any]] = {}
@@ -303,9 +801,19 @@ def _target_fetch_fulfillment(
         return {}
 
 
+_TARGET_IN_STOCK_STATUSES = frozenset({"IN_STOCK", "LIMITED_STOCK"})
+
+# In-stock labels indexed by channel bitmask (bit i set = _TARGET_CHANNELS[i])
+_TARGET_CHANNELS = ("Ship", "Pickup", "Ship-to-Store", "In-Store")
+_TARGET_IN_STOCK_LABELS = tuple(
+    f"In Stock ({', '.join(c for i, c in enumerate(_TARGET_CHANNELS) if mask & (1 << i))})"
+    for mask in range(1 << len(_TARGET_CHANNELS))
+)
+
+
 def _target_is_in_stock_status(status: str) -> bool:
     s = (status or "").strip().upper()
-    return s in {"IN_STOCK", "LIMITED_STOCK"}
+    return s in _TARGET_IN_STOCK_STATUSES
 
 
 def _target_stock_from_fulfillment(ful: Dict[str, Any]) -> Tuple[bool, str]:
@@ -324,20 +832,12 @@ def _target_stock_from_fulfillment(ful: Dict[str, Any]) -> Tuple[bool, str]:
             pickup_ok = pickup_ok or _target_is_in_stock_status((opt.get("order_pickup") or {}).get("availability_status") or "")
             ship_to_store_ok = ship_to_store_ok or _target_is_in_stock_status((opt.get("ship_to_store") or {}).get("availability_status") or "")
             in_store_ok = in_store_ok or _target_is_in_stock_status((opt.get("in_store_only") or {}).get("availability_status") or "")
+            if pickup_ok and ship_to_store_ok and in_store_ok:
+                break  # Remaining stores can't change the result
 
-    in_stock = ship_ok or pickup_ok or ship_to_store_ok or in_store_ok
-    if in_stock:
-        channels = []
-        if ship_ok:
-            channels.append("Ship")
-        if pickup_ok:
-            channels.append("Pickup")
-        if ship_to_store_ok:
-            channels.append("Ship-to-Store")
-        if in_store_ok:
-            channels.append("In-Store")
-        suffix = f" ({', '.join(channels)})" if channels else ""
-        return True, f"In Stock{suffix}"
+    mask = ship_ok | (pickup_ok << 1) | (ship_to_store_ok << 2) | (in_store_ok << 3)
+    if mask:
+        return True, _TARGET_IN_STOCK_LABELS[mask]
 
     # Out of stock: use the most specific status we have.
     if ship_status:
@@ -353,11 +853,16 @@ def scan_target(query: str = "pokemon trading cards", zip_code: str = "90210") -
     products = []
     
     cache_key_query = f"{query}|{zip_code}"
-    cached = Cache.get("target", cache_key_query)
+    cached = Cache.get_products("target", cache_key_query)
     if cached:
-        return [Product(**p) for p in cached]
+        return cached
     
-    session = get_session("target")
+    session = get_target_client()
+    now_iso = datetime.now().isoformat()
+    
+    # Resolve the store while the search request is in flight; the lookup
+    # only needs the ZIP and is cached per ZIP, so it never waits on search.
+    store_future = _target_store_executor.submit(_target_get_store_id, zip_code, session)
     
     try:
         api_url = "https://redsky.target.com/redsky_aggregations/v1/web/plp_search_v2"
@@ -372,18 +877,18 @@ def scan_target(query: str = "pokemon trading cards", zip_code: str = "90210") -
             "page": f"/s/{query.replace(' ', '+')}",
             "platform": "desktop",
             "pricing_store_id": "911",
-            "visitor_id": f"PKM_{int(time.time())}",
+            "visitor_id": f"PKM_{time.time_ns() // 1_000_000_000}",
             "zip": zip_code,
         }
         
         headers = get_stealth_headers()
         headers["Accept"] = "application/json"
         
-        time.sleep(get_random_delay())
+        _host_limiter.acquire("target")
         resp = session.get(api_url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
         
         if resp.status_code == 200:
-            data = resp.json()
+            data = _json_loads(resp.content)
             items = data.get("data", {}).get("search", {}).get("products", [])
             
             tcins: List[str] = []
@@ -391,7 +896,7 @@ def scan_target(query: str = "pokemon trading cards", zip_code: str = "90210") -
                 p = item.get("item", {}) or {}
                 title = _html.unescape(p.get("product_description", {}).get("title", "") or "")
                 
-                if "pokemon" not in title.lower() and "pokémon" not in title.lower():
+                if not _POKEMON_RE.search(title):
                     continue
                 
                 price_data = item.get("price") or {}
@@ -409,8 +914,7 @@ def scan_target(query: str = "pokemon trading cards", zip_code: str = "90210") -
                 # Parse price safely
                 price_val = price_data.get("current_retail", 0) or price_data.get("reg_retail", 0)
                 if not price_val:
-                    price_str = price_data.get("formatted_current_price", "")
-                    price_val = float(''.join(c for c in price_str if c.isdigit() or c == '.') or '0')
+                    price_val = parse_price(price_data.get("formatted_current_price", ""))
 
                 tcin = str(item.get("tcin") or item.get("original_tcin") or "").strip()
                 if tcin:
@@ -425,13 +929,13 @@ def scan_target(query: str = "pokemon trading cards", zip_code: str = "90210") -
                     stock=False,
                     stock_status="Checking...",
                     image_url=p.get("enrichment", {}).get("images", {}).get("primary_image_url", ""),
-                    last_checked=datetime.now().isoformat(),
+                    last_checked=now_iso,
                     confidence=40.0,
                     detection_method="target_redsky_plp",
                 ))
 
             # Enrich with fulfillment for accurate stock status.
-            store_id = _target_get_store_id(zip_code, session)
+            store_id = store_future.result()
             if store_id and tcins:
                 ful_map = _target_fetch_fulfillment(tcins, store_id=store_id, zip_code=zip_code, session=session)
                 for prod in products:
@@ -461,10 +965,10 @@ def scan_target(query: str = "pokemon trading cards", zip_code: str = "90210") -
                     prod.detection_method = "target_redsky_store_lookup_failed"
         
         if products:
-            Cache.set("target", cache_key_query, [p.to_dict() for p in products])
+            Cache.set_products("target", cache_key_query, products)
             
     except Exception as e:
-        print(f"Target error: {e}")
+        logger.error(f"Target error: {e}")
     
     return products
 
@@ -480,11 +984,12 @@ def scan_walmart(query: str = "pokemon trading cards") -> List[Product]:
     """
     products = []
     
-    cached = Cache.get("walmart", query)
+    cached = Cache.get_products("walmart", query)
     if cached:
-        return [Product(**p) for p in cached]
+        return cached
     
     session = get_session("walmart")
+    now_iso = datetime.now().isoformat()
     
     try:
         # Walmart's search API endpoint
@@ -494,7 +999,7 @@ def scan_walmart(query: str = "pokemon trading cards") -> List[Product]:
         headers.update({
             "Accept": "application/json",
             "Content-Type": "application/json",
-            "X-O-CORRELATION-ID": f"pkm-{int(time.time())}",
+            "X-O-CORRELATION-ID": f"pkm-{time.time_ns() // 1_000_000_000}",
             "X-O-SEGMENT": "oaoh",
             "Referer": f"https://www.walmart.com/search?q={query.replace(' ', '+')}",
         })
@@ -525,18 +1030,18 @@ def scan_walmart(query: str = "pokemon trading cards") -> List[Product]:
             }
         }
         
-        time.sleep(get_random_delay())
+        _host_limiter.acquire("walmart")
         resp = session.post(search_url, json=payload, headers=headers, timeout=REQUEST_TIMEOUT)
         
         if resp.status_code == 200:
-            data = resp.json()
+            data = _json_loads(resp.content)
             stacks = data.get("data", {}).get("search", {}).get("searchResult", {}).get("itemStacks", [])
             
             for stack in stacks:
                 for item in stack.get("items", [])[:24]:
                     name = item.get("name", "")
                     
-                    if "pokemon" not in name.lower() and "pokémon" not in name.lower():
+                    if not _POKEMON_RE.search(name):
                         continue
                     
                     price_info = item.get("priceInfo", {}).get("currentPrice", {})
@@ -556,7 +1061,7 @@ def scan_walmart(query: str = "pokemon trading cards") -> List[Product]:
                         stock=in_stock,
                         stock_status="In Stock" if in_stock else "Out of Stock",
                         image_url=item.get("imageInfo", {}).get("thumbnailUrl", ""),
-                        last_checked=datetime.now().isoformat(),
+                        last_checked=now_iso,
                     ))
         
         # Fallback to scraping if GraphQL fails
@@ -564,17 +1069,17 @@ def scan_walmart(query: str = "pokemon trading cards") -> List[Product]:
             products = _scan_walmart_scrape(query, session)
         
         if products:
-            Cache.set("walmart", query, [p.to_dict() for p in products])
+            Cache.set_products("walmart", query, products)
             
     except Exception as e:
-        print(f"Walmart error: {e}")
+        logger.error(f"Walmart error: {e}")
         # Try scrape fallback
         try:
             products = _scan_walmart_scrape(query, session)
             if products:
-                Cache.set("walmart", query, [p.to_dict() for p in products])
+                Cache.set_products("walmart", query, products)
         except Exception as e2:
-            print(f"Walmart scrape fallback error: {e2}")
+            logger.error(f"Walmart scrape fallback error: {e2}")
     
     return products
 
@@ -586,24 +1091,28 @@ def _scan_walmart_scrape(query: str, session: requests.Session) -> List[Product]
     if not BS4_AVAILABLE:
         return products
     
+    now_iso = datetime.now().isoformat()
+    
     try:
         search_url = f"https://www.walmart.com/search?q={query.replace(' ', '+')}"
         headers = get_stealth_headers()
         
-        time.sleep(get_random_delay())
+        _host_limiter.acquire("walmart")
         resp = session.get(search_url, headers=headers, timeout=REQUEST_TIMEOUT)
         
         if resp.status_code == 200:
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            # Only the embedded JSON script tags are used; skip building the rest of the tree
+            bs4 = _bs4()
+            soup = bs4.BeautifulSoup(resp.text, BS4_PARSER, parse_only=bs4.SoupStrainer('script', type='application/json'))
             
             # Look for product data in script tags
             for script in soup.find_all('script', type='application/json'):
                 try:
-                    data = json.loads(script.string or '{}')
+                    data = _json_loads(script.string or '{}')
                     # Parse Walmart's embedded JSON data
                     items = _extract_walmart_items(data)
                     for item in items:
-                        if "pokemon" in item.get("name", "").lower():
+                        if _POKEMON_RE.search(item.get("name", "")):
                             products.append(Product(
                                 name=item.get("name", ""),
                                 retailer="Walmart",
@@ -613,54 +1122,72 @@ def _scan_walmart_scrape(query: str, session: requests.Session) -> List[Product]
                                 stock=item.get("in_stock", False),
                                 stock_status="In Stock" if item.get("in_stock") else "Out of Stock",
                                 image_url=item.get("image", ""),
-                                last_checked=datetime.now().isoformat(),
+                                last_checked=now_iso,
                             ))
                 except json.JSONDecodeError:
                     continue
     except Exception as e:
-        print(f"Walmart scrape error: {e}")
+        logger.error(f"Walmart scrape error: {e}")
     
     return products
 
 
+WALMART_MAX_ITEMS = 24
+
+
 def _extract_walmart_items(data: dict, items: list = None) -> list:
-    """Recursively extract product items from Walmart's JSON."""
+    """
+    Extract product items from Walmart's JSON.
+    
+    Walks depth-first with an explicit stack (same order as recursing) and
+    stops as soon as WALMART_MAX_ITEMS products are found, instead of
+    descending through every telemetry subtree of the page payload.
+    """
     if items is None:
         items = []
     
-    if isinstance(data, dict):
-        # Check if this looks like a product
-        if "name" in data and ("usItemId" in data or "canonicalUrl" in data):
-            price = 0
-            if "priceInfo" in data:
-                price = data["priceInfo"].get("currentPrice", {}).get("price", 0)
-            elif "price" in data:
-                price = data.get("price", 0)
+    stack = [data]
+    while stack and len(items) < WALMART_MAX_ITEMS:
+        node = stack.pop()
+        
+        if isinstance(node, dict):
+            # Check if this looks like a product
+            if "name" in node and ("usItemId" in node or "canonicalUrl" in node):
+                price = 0
+                if "priceInfo" in node:
+                    price = node["priceInfo"].get("currentPrice", {}).get("price", 0)
+                elif "price" in node:
+                    price = node.get("price", 0)
+                
+                items.append({
+                    "name": node.get("name", ""),
+                    "price": price,
+                    "url": f"https://www.walmart.com{node.get('canonicalUrl', '')}" if node.get('canonicalUrl') else "",
+                    "sku": node.get("usItemId", ""),
+                    "in_stock": node.get("availabilityStatusV2", {}).get("value", "").upper() in ["IN_STOCK", "AVAILABLE"],
+                    "image": node.get("imageInfo", {}).get("thumbnailUrl", ""),
+                })
             
-            items.append({
-                "name": data.get("name", ""),
-                "price": price,
-                "url": f"https://www.walmart.com{data.get('canonicalUrl', '')}" if data.get('canonicalUrl') else "",
-                "sku": data.get("usItemId", ""),
-                "in_stock": data.get("availabilityStatusV2", {}).get("value", "").upper() in ["IN_STOCK", "AVAILABLE"],
-                "image": data.get("imageInfo", {}).get("thumbnailUrl", ""),
-            })
+            # Visit dict values in order
+            stack.extend(reversed(node.values()))
         
-        # Recurse into dict values
-        for v in data.values():
-            _extract_walmart_items(v, items)
-    
-    elif isinstance(data, list):
-        for item in data:
-            _extract_walmart_items(item, items)
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
     
-    return items[:24]  # Limit results
+    return items[:WALMART_MAX_ITEMS]  # Limit results
 
 
 # =============================================================================
 # BEST BUY - API/SCRAPE
 # =============================================================================
 
+# Scrape selectors, compiled on first use by _css()
+_BESTBUY_ITEM_CSS = '.sku-item, .list-item'
+_BESTBUY_NAME_CSS = '.sku-title a, .sku-header a'
+_BESTBUY_PRICE_CSS = '[data-price], .priceView-customer-price span'
+_BESTBUY_CART_CSS = '.add-to-cart-button:not(.btn-disabled)'
+
+
 def scan_bestbuy(query: str = "pokemon trading cards") -> List[Product]:
     """
     Scan Best Buy using API or scraping fallback.
@@ -679,12 +1206,12 @@ def scan_bestbuy(query: str = "pokemon trading cards") -> List[Product]:
     
     products = []
     
-    cached = Cache.get("bestbuy", query)
+    cached = Cache.get_products("bestbuy", query)
     if cached:
-        return [Product(**p) for p in cached]
+        return cached
     
     session = get_session("bestbuy")
-    api_key = os.environ.get("BESTBUY_API_KEY", "")
+    now_iso = datetime.now().isoformat()
     
     try:
         if api_key:
@@ -697,13 +1224,19 @@ def scan_bestbuy(query: str = "pokemon trading cards") -> List[Product]:
                 "pageSize": 24,
             }
             
-            time.sleep(get_random_delay())
-            resp = session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+            _host_limiter.acquire("bestbuy")
+            resp = session.get(url, params=params, headers=Cache.validators("bestbuy", query), timeout=REQUEST_TIMEOUT)
+            
+            if resp.status_code == 304:
+                # Unchanged since it was cached: reuse it instead of re-parsing
+                revalidated = Cache.revalidated_products("bestbuy", query, now_iso)
+                if revalidated:
+                    return revalidated
             
             if resp.status_code == 200:
-                data = resp.json()
+                data = _json_loads(resp.content)
                 for item in data.get("products", []):
-                    if "pokemon" in item.get("name", "").lower():
+                    if _POKEMON_RE.search(item.get("name", "")):
                         in_stock = item.get("onlineAvailability", False)
                         products.append(Product(
                             name=item.get("name", ""),
@@ -714,45 +1247,51 @@ def scan_bestbuy(query: str = "pokemon trading cards") -> List[Product]:
                             stock=in_stock,
                             stock_status="In Stock" if in_stock else "Out of Stock",
                             image_url=item.get("image", ""),
-                            last_checked=datetime.now().isoformat(),
+                            last_checked=now_iso,
                         ))
         else:
             # Scrape fallback
             search_url = f"https://www.bestbuy.com/site/searchpage.jsp?st={query.replace(' ', '+')}"
             headers = get_stealth_headers()
+            headers.update(Cache.validators("bestbuy", query))
             
-            time.sleep(get_random_delay())
+            _host_limiter.acquire("bestbuy")
             resp = session.get(search_url, headers=headers, timeout=REQUEST_TIMEOUT)
             
+            if resp.status_code == 304:
+                # Unchanged since it was cached: reuse it instead of re-parsing
+                revalidated = Cache.revalidated_products("bestbuy", query, now_iso)
+                if revalidated:
+                    return revalidated
+            
             if resp.status_code == 200 and BS4_AVAILABLE:
-                soup = BeautifulSoup(resp.text, 'html.parser')
-                items = soup.select('.sku-item, .list-item')
+                soup = _bs4().BeautifulSoup(resp.text, BS4_PARSER)
+                items = _css(_BESTBUY_ITEM_CSS).select(soup)
+                name_css = _css(_BESTBUY_NAME_CSS)
+                price_css = _css(_BESTBUY_PRICE_CSS)
+                cart_css = _css(_BESTBUY_CART_CSS)
                 
-                for item in items[:20]:
-                    name_elem = item.select_one('.sku-title a, .sku-header a')
-                    price_elem = item.select_one('[data-price], .priceView-customer-price span')
+                for item in items:
+                    if len(products) >= MAX_SCRAPED_PRODUCTS:
+                        break
+                    name_elem = name_css.select_one(item)
+                    price_elem = price_css.select_one(item)
                     
                     if not name_elem:
                         continue
                     
                     name = name_elem.get_text(strip=True)
-                    if "pokemon" not in name.lower():
+                    if not _POKEMON_RE.search(name):
                         continue
                     
-                    price = 0
-                    if price_elem:
-                        price_text = ''.join(c for c in price_elem.get_text() if c.isdigit() or c == '.')
-                        try:
-                            price = float(price_text) if price_text else 0
-                        except:
-                            pass
+                    price = parse_price(price_elem.get_text()) if price_elem else 0
                     
                     url = name_elem.get('href', '')
                     if not url.startswith('http'):
                         url = f"https://www.bestbuy.com{url}"
                     
                     # Check for add to cart button
-                    cart_btn = item.select_one('.add-to-cart-button:not(.btn-disabled)')
+                    cart_btn = cart_css.select_one(item)
                     in_stock = cart_btn is not None
                     
                     products.append(Product(
@@ -762,14 +1301,14 @@ def scan_bestbuy(query: str = "pokemon trading cards") -> List[Product]:
                         url=url,
                         stock=in_stock,
                         stock_status="In Stock" if in_stock else "Out of Stock",
-                        last_checked=datetime.now().isoformat(),
+                        last_checked=now_iso,
                     ))
         
         if products:
-            Cache.set("bestbuy", query, [p.to_dict() for p in products])
+            Cache.set_products("bestbuy", query, products, resp)
             
     except Exception as e:
-        print(f"Best Buy error: {e}")
+        logger.error(f"Best Buy error: {e}")
     
     return products
 
@@ -778,52 +1317,66 @@ def scan_bestbuy(query: str = "pokemon trading cards") -> List[Product]:
 # GAMESTOP - SCRAPE
 # =============================================================================
 
+# Scrape selectors, compiled on first use by _css()
+_GAMESTOP_ITEM_CSS = '.product-tile, [data-product-tile]'
+_GAMESTOP_NAME_CSS = '.product-name a, .product-tile-name a, h3 a'
+_GAMESTOP_PRICE_CSS = '.actual-price, .price-sales'
+_GAMESTOP_AVAIL_CSS = '.add-to-cart, .availability-message'
+
+
 def scan_gamestop(query: str = "pokemon cards") -> List[Product]:
     """Scan GameStop by scraping. Uses session pooling."""
     products = []
     
-    cached = Cache.get("gamestop", query)
+    cached = Cache.get_products("gamestop", query)
     if cached:
-        return [Product(**p) for p in cached]
+        return cached
     
     session = get_session("gamestop")
+    now_iso = datetime.now().isoformat()
     
     try:
         search_url = f"https://www.gamestop.com/search/?q={query.replace(' ', '+')}"
         headers = get_stealth_headers()
+        headers.update(Cache.validators("gamestop", query))
         
-        time.sleep(get_random_delay())
+        _host_limiter.acquire("gamestop")
         resp = session.get(search_url, headers=headers, timeout=REQUEST_TIMEOUT)
         
+        if resp.status_code == 304:
+            # Unchanged since it was cached: reuse it instead of re-parsing
+            revalidated = Cache.revalidated_products("gamestop", query, now_iso)
+            if revalidated:
+                return revalidated
+        
         if resp.status_code == 200 and BS4_AVAILABLE:
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            items = soup.select('.product-tile, [data-product-tile]')
+            soup = _bs4().BeautifulSoup(resp.text, BS4_PARSER)
+            items = _css(_GAMESTOP_ITEM_CSS).select(soup)
+            name_css = _css(_GAMESTOP_NAME_CSS)
+            price_css = _css(_GAMESTOP_PRICE_CSS)
+            avail_css = _css(_GAMESTOP_AVAIL_CSS)
             
-            for item in items[:20]:
-                name_elem = item.select_one('.product-name a, .product-tile-name a, h3 a')
-                price_elem = item.select_one('.actual-price, .price-sales')
+            for item in items:
+                if len(products) >= MAX_SCRAPED_PRODUCTS:
+                    break
+                name_elem = name_css.select_one(item)
+                price_elem = price_css.select_one(item)
                 
                 if not name_elem:
                     continue
                 
                 name = name_elem.get_text(strip=True)
-                if "pokemon" not in name.lower():
+                if not _POKEMON_RE.search(name):
                     continue
                 
-                price = 0
-                if price_elem:
-                    price_text = ''.join(c for c in price_elem.get_text() if c.isdigit() or c == '.')
-                    try:
-                        price = float(price_text) if price_text else 0
-                    except:
-                        pass
+                price = parse_price(price_elem.get_text()) if price_elem else 0
                 
                 url = name_elem.get('href', '')
                 if not url.startswith('http'):
                     url = f"https://www.gamestop.com{url}"
                 
                 # Check availability
-                avail_elem = item.select_one('.add-to-cart, .availability-message')
+                avail_elem = avail_css.select_one(item)
                 in_stock = avail_elem is not None and 'unavailable' not in (avail_elem.get_text() or '').lower()
                 
                 products.append(Product(
@@ -833,14 +1386,14 @@ def scan_gamestop(query: str = "pokemon cards") -> List[Product]:
                     url=url,
                     stock=in_stock,
                     stock_status="In Stock" if in_stock else "Out of Stock",
-                    last_checked=datetime.now().isoformat(),
+                    last_checked=now_iso,
                 ))
         
         if products:
-            Cache.set("gamestop", query, [p.to_dict() for p in products])
+            Cache.set_products("gamestop", query, products, resp)
             
     except Exception as e:
-        print(f"GameStop error: {e}")
+        logger.error(f"GameStop error: {e}")
     
     return products
 
@@ -849,73 +1402,186 @@ def scan_gamestop(query: str = "pokemon cards") -> List[Product]:
 # POKEMON CENTER - SCRAPE
 # =============================================================================
 
+# Scrape selectors, compiled on first use by _css()
+_POKEMONCENTER_ITEM_CSS = '[data-testid="product-card"], .product-card, .product-tile'
+_POKEMONCENTER_NAME_CSS = 'h2, h3, .product-name, [data-testid="product-name"]'
+_POKEMONCENTER_PRICE_CSS = '[data-testid="price"], .price, .product-price'
+_POKEMONCENTER_LINK_CSS = 'a[href*="/product/"]'
+_POKEMONCENTER_OOS_CSS = '.out-of-stock, [data-testid="out-of-stock"]'
+
+# Every element any of the NAME/PRICE/LINK/OOS selectors can match, as one
+# XPath: a card's subtree is walked once (in document order) and each hit is
+# sorted into its role(s) by _pokemoncenter_card_fields. Cards themselves
+# are recognized by _is_pokemoncenter_card as they close.
+_POKEMONCENTER_FIELDS_XPATH = (
+    './/*['
+    f'self::h2 or self::h3 or {_has_class("product-name")} or @data-testid="product-name"'
+    f' or @data-testid="price" or {_has_class("price")} or {_has_class("product-price")}'
+    ' or (self::a and contains(@href, "/product/"))'
+    f' or {_has_class("out-of-stock")} or @data-testid="out-of-stock"'
+    ']'
+)
+
+# Search pages run to hundreds of KB; cards are read in chunks of this size
+POKEMONCENTER_STREAM_CHUNK = 16384
+
+_POKEMONCENTER_CARD_CLASSES = frozenset({"product-card", "product-tile"})
+
+
+def _is_pokemoncenter_card(element) -> bool:
+    """Match _POKEMONCENTER_ITEM_CSS against one lxml element."""
+    if element.get("data-testid") == "product-card":
+        return True
+    classes = element.get("class")
+    return bool(classes) and not _POKEMONCENTER_CARD_CLASSES.isdisjoint(classes.split())
+
+
+def _pokemoncenter_card_fields(item) -> Optional[Tuple[str, str, str, bool]]:
+    """
+    (name, price_text, href, out_of_stock) for one lxml card, or None if nameless.
+    
+    Name, price and link take the first match in document order, like
+    select_one with the corresponding _POKEMONCENTER_*_CSS selector.
+    """
+    name_elem = price_elem = None
+    href = ""
+    out_of_stock = False
+    
+    for el in _xpath(_POKEMONCENTER_FIELDS_XPATH)(item):
+        testid = el.get("data-testid")
+        classes = (el.get("class") or "").split()
+        
+        if name_elem is None and (el.tag in ("h2", "h3") or testid == "product-name" or "product-name" in classes):
+            name_elem = el
+        if price_elem is None and (testid == "price" or "price" in classes or "product-price" in classes):
+            price_elem = el
+        if not href and el.tag == "a":
+            link = el.get("href") or ""
+            if "/product/" in link:
+                href = link
+        if testid == "out-of-stock" or "out-of-stock" in classes:
+            out_of_stock = True
+    
+    if name_elem is None:
+        return None
+    return (
+        _text_strip(name_elem),
+        "".join(price_elem.itertext()) if price_elem is not None else "",
+        href,
+        out_of_stock,
+    )
+
+
+def _pokemoncenter_cards(resp) -> Iterator[Tuple[str, str, str, bool]]:
+    """
+    Yield (name, price_text, href, out_of_stock) per Pokemon Center product card.
+    
+    With lxml the (stream=True) response body is fed through a pull parser
+    chunk by chunk, and each card is queried with one precompiled XPath as
+    soon as its closing tag arrives - a consumer that stops early stops the
+    download too. bs4 on the full body is the fallback.
+    """
+    if LXML_AVAILABLE:
+        from lxml import etree
+        parser = etree.HTMLPullParser(events=("end",), encoding=resp.encoding)
+        
+        def cards(events):
+            for _, item in events:
+                if _is_pokemoncenter_card(item):
+                    card = _pokemoncenter_card_fields(item)
+                    if card is not None:
+                        yield card
+        
+        fed = False
+        for chunk in resp.iter_content(POKEMONCENTER_STREAM_CHUNK):
+            if chunk:
+                parser.feed(chunk)
+                fed = True
+                yield from cards(parser.read_events())
+        if fed:
+            parser.close()
+            yield from cards(parser.read_events())
+        return
+    
+    soup = _bs4().BeautifulSoup(resp.text, BS4_PARSER)
+    name_css = _css(_POKEMONCENTER_NAME_CSS)
+    price_css = _css(_POKEMONCENTER_PRICE_CSS)
+    link_css = _css(_POKEMONCENTER_LINK_CSS)
+    oos_css = _css(_POKEMONCENTER_OOS_CSS)
+    
+    for item in _css(_POKEMONCENTER_ITEM_CSS).select(soup):
+        name_elem = name_css.select_one(item)
+        if not name_elem:
+            continue
+        price_elem = price_css.select_one(item)
+        link_elem = link_css.select_one(item)
+        yield (
+            name_elem.get_text(strip=True),
+            price_elem.get_text() if price_elem else "",
+            link_elem.get('href', '') if link_elem else "",
+            oos_css.select_one(item) is not None,
+        )
+
+
 def scan_pokemoncenter(query: str = "trading cards") -> List[Product]:
     """Scan Pokemon Center official store. Uses session pooling."""
     products = []
     
-    cached = Cache.get("pokemoncenter", query)
+    cached = Cache.get_products("pokemoncenter", query)
     if cached:
-        return [Product(**p) for p in cached]
+        return cached
     
     session = get_session("pokemoncenter")
+    now_iso = datetime.now().isoformat()
     
     try:
         search_url = f"https://www.pokemoncenter.com/search/{query.replace(' ', '%20')}"
         headers = get_stealth_headers()
         headers["Accept"] = "text/html,application/xhtml+xml"
+        headers.update(Cache.validators("pokemoncenter", query))
         
-        time.sleep(get_random_delay())
-        resp = session.get(search_url, headers=headers, timeout=REQUEST_TIMEOUT)
+        _host_limiter.acquire("pokemoncenter")
+        # Streamed: parsing stops (and the rest of the body is never read)
+        # once MAX_SCRAPED_PRODUCTS cards are in hand. Leaving the block
+        # closes the response on every path: a no-op once the body was read
+        # to the end, otherwise it drops the unread remainder.
+        with session.get(search_url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True) as resp:
+            if resp.status_code == 304:
+                # Unchanged since it was cached: reuse it instead of re-parsing
+                revalidated = Cache.revalidated_products("pokemoncenter", query, now_iso)
+                if revalidated:
+                    return revalidated
         
-        if resp.status_code == 200 and BS4_AVAILABLE:
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            items = soup.select('[data-testid="product-card"], .product-card, .product-tile')
-            
-            for item in items[:20]:
-                name_elem = item.select_one('h2, h3, .product-name, [data-testid="product-name"]')
-                price_elem = item.select_one('[data-testid="price"], .price, .product-price')
-                link_elem = item.select_one('a[href*="/product/"]')
-                
-                if not name_elem:
-                    continue
-                
-                name = name_elem.get_text(strip=True)
-                
-                price = 0
-                if price_elem:
-                    price_text = ''.join(c for c in price_elem.get_text() if c.isdigit() or c == '.')
-                    try:
-                        price = float(price_text) if price_text else 0
-                    except:
-                        pass
+            if resp.status_code == 200 and (LXML_AVAILABLE or BS4_AVAILABLE):
+                for name, price_text, href, out_of_stock in _pokemoncenter_cards(resp):
+                    price = parse_price(price_text) if price_text else 0
                 
-                url = "https://www.pokemoncenter.com"
-                if link_elem:
-                    href = link_elem.get('href', '')
+                    url = "https://www.pokemoncenter.com"
                     if href.startswith('/'):
                         url = f"https://www.pokemoncenter.com{href}"
                     elif href.startswith('http'):
                         url = href
                 
-                # Check stock
-                oos_elem = item.select_one('.out-of-stock, [data-testid="out-of-stock"]')
-                in_stock = oos_elem is None and price > 0
+                    # Check stock
+                    in_stock = not out_of_stock and price > 0
                 
-                products.append(Product(
-                    name=name,
-                    retailer="Pokemon Center",
-                    price=price,
-                    url=url,
-                    stock=in_stock,
-                    stock_status="In Stock" if in_stock else "Out of Stock",
-                    last_checked=datetime.now().isoformat(),
-                ))
+                    products.append(Product(
+                        name=name,
+                        retailer="Pokemon Center",
+                        price=price,
+                        url=url,
+                        stock=in_stock,
+                        stock_status="In Stock" if in_stock else "Out of Stock",
+                        last_checked=now_iso,
+                    ))
+                    if len(products) >= MAX_SCRAPED_PRODUCTS:
+                        break
         
         if products:
-            Cache.set("pokemoncenter", query, [p.to_dict() for p in products])
+            Cache.set_products("pokemoncenter", query, products, resp)
             
     except Exception as e:
-        print(f"Pokemon Center error: {e}")
+        logger.error(f"Pokemon Center error: {e}")
     
     return products
 
@@ -924,6 +1590,9 @@ def scan_pokemoncenter(query: str = "trading cards") -> List[Product]:
 # POKEMON TCG API - CARD DATA + TCGPLAYER PRICES
 # =============================================================================
 
+POKEMON_TCG_SELECT_FIELDS = "id,name,set,tcgplayer,images"
+
+
 def scan_cards(card_name: str = "", set_name: str = "") -> List[Product]:
     """
     Get card data from Pokemon TCG API.
@@ -933,11 +1602,12 @@ def scan_cards(card_name: str = "", set_name: str = "") -> List[Product]:
     products = []
     
     query = f"{card_name}_{set_name}"
-    cached = Cache.get("pokemontcgapi", query)
+    cached = Cache.get_products("pokemontcgapi", query)
     if cached:
-        return [Product(**p) for p in cached]
+        return cached
     
     session = get_session("pokemontcgapi")
+    now_iso = datetime.now().isoformat()
     
     try:
         api_url = "https://api.pokemontcg.io/v2/cards"
@@ -955,14 +1625,28 @@ def scan_cards(card_name: str = "", set_name: str = "") -> List[Product]:
         # Add API key if available (increases rate limit from 1000/day to 20000/day)
         if POKEMON_TCG_API_KEY:
             headers["X-Api-Key"] = POKEMON_TCG_API_KEY
+        headers.update(Cache.validators("pokemontcgapi", query))
         
-        params = {"q": q, "pageSize": 24, "orderBy": "-tcgplayer.prices.holofoil.market"}
+        params = {
+            "q": q,
+            "pageSize": 24,
+            "orderBy": "-tcgplayer.prices.holofoil.market",
+            # Only the top-level fields read below: skips attacks, rules,
+            # legalities etc., most of each card record
+            "select": POKEMON_TCG_SELECT_FIELDS,
+        }
         
-        time.sleep(get_random_delay())
+        _host_limiter.acquire("pokemontcgapi")
         resp = session.get(api_url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
         
+        if resp.status_code == 304:
+            # Unchanged since it was cached: reuse it instead of re-parsing
+            revalidated = Cache.revalidated_products("pokemontcgapi", query, now_iso)
+            if revalidated:
+                return revalidated
+        
         if resp.status_code == 200:
-            data = resp.json()
+            data = _json_loads(resp.content)
             
             for card in data.get("data", []):
                 tcgplayer = card.get("tcgplayer", {})
@@ -982,14 +1666,14 @@ def scan_cards(card_name: str = "", set_name: str = "") -> List[Product]:
                     stock_status="Available" if market_price > 0 else "Check Site",
                     image_url=card.get("images", {}).get("small", ""),
                     category="Singles",
-                    last_checked=datetime.now().isoformat(),
+                    last_checked=now_iso,
                 ))
         
         if products:
-            Cache.set("pokemontcgapi", query, [p.to_dict() for p in products])
+            Cache.set_products("pokemontcgapi", query, products, resp)
             
     except Exception as e:
-        print(f"Pokemon TCG API error: {e}")
+        logger.error(f"Pokemon TCG API error: {e}")
     
     return products
 
@@ -998,18 +1682,38 @@ def scan_cards(card_name: str = "", set_name: str = "") -> List[Product]:
 # SEARCH RELEVANCE HELPER
 # =============================================================================
 
-def matches_query(product_name: str, query: str) -> tuple[bool, int]:
-    """
-    Check if a product name matches the search query.
-    Returns (matches, score) where higher score = better match.
+_QUERY_IGNORE_WORDS = frozenset({'pokemon', 'trading', 'cards', 'card', 'tcg', 'the', 'and', 'of', 'a'})
+
+
+@lru_cache(maxsize=256)
+def _query_terms(query: str) -> Tuple[Tuple[str, ...], str, int]:
     """
-    name_lower = product_name.lower()
-    query_lower = query.lower()
+    Tokenize a search query once: (terms, phrase, min_matches).
     
+    Every product in a scan is scored against the same query, so the
+    split/filter work is shared instead of repeated per product.
+    """
     # Extract key search terms (ignore common words)
-    ignore_words = {'pokemon', 'trading', 'cards', 'card', 'tcg', 'the', 'and', 'of', 'a'}
-    query_terms = [w for w in query_lower.split() if w not in ignore_words and len(w) > 2]
+    query_terms = tuple(
+        w for w in query.lower().split()
+        if w not in _QUERY_IGNORE_WORDS and len(w) > 2
+    )
     
+    # Require at least half the terms to match (or all if only 1-2 terms)
+    min_matches = max(1, len(query_terms) // 2) if len(query_terms) > 2 else len(query_terms)
+    
+    return query_terms, ' '.join(query_terms), min_matches
+
+
+# Fuzzy tier (rapidfuzz only): a term that is not a substring of the name
+# still counts when some word of the name is this similar to it. Short
+# terms are excluded - one edit on a 3-4 letter word is a different word.
+FUZZY_MATCH_THRESHOLD = 85
+FUZZY_MIN_TERM_LEN = 5
+
+
+def _score_name(name_lower: str, query_terms: Tuple[str, ...], query_phrase: str, min_matches: int) -> tuple[bool, int]:
+    """Score one lowercased product name against pre-tokenized query terms."""
     # If no specific terms, match any Pokemon product
     if not query_terms:
         return ('pokemon' in name_lower or 'pokémon' in name_lower, 1)
@@ -1017,46 +1721,129 @@ def matches_query(product_name: str, query: str) -> tuple[bool, int]:
     # Score based on how many query terms match
     score = 0
     matched_terms = 0
+    padded_name = f" {name_lower} "
+    name_words = None
     
     for term in query_terms:
         if term in name_lower:
             matched_terms += 1
             # Exact word match scores higher
-            if f" {term} " in f" {name_lower} ":
+            if f" {term} " in padded_name:
                 score += 10
             else:
                 score += 5
+        elif RAPIDFUZZ_AVAILABLE and len(term) >= FUZZY_MIN_TERM_LEN:
+            if name_words is None:
+                name_words = name_lower.split()
+            if fuzz_process.extractOne(term, name_words, scorer=fuzz.ratio,
+                                       score_cutoff=FUZZY_MATCH_THRESHOLD):
+                # Near miss ("rivals" vs "rival") - ranks below any exact hit
+                matched_terms += 1
+                score += 3
     
     # Check for set name patterns (e.g., "destined rivals" should match "Destined Rivals")
     # Handle multi-word set names
     if len(query_terms) >= 2:
         # Check if consecutive terms match as a phrase
-        query_phrase = ' '.join(query_terms)
         if query_phrase in name_lower:
             score += 50  # Big bonus for exact phrase match
             matched_terms = len(query_terms)
     
-    # Require at least half the terms to match (or all if only 1-2 terms)
-    min_matches = max(1, len(query_terms) // 2) if len(query_terms) > 2 else len(query_terms)
     matches = matched_terms >= min_matches
     
     return (matches, score)
 
 
+def matches_query(product_name: str, query: str) -> tuple[bool, int]:
+    """
+    Check if a product name matches the search query.
+    Returns (matches, score) where higher score = better match.
+    """
+    return _score_name(product_name.lower(), *_query_terms(query))
+
+
+@lru_cache(maxsize=64)
+def _rank_by_relevance(names: Tuple[str, ...], query: str) -> Tuple[Tuple[int, int], ...]:
+    """
+    Return (index, score) for each name matching query, best first.
+    
+    Memoized on the exact name list, so repeat scans whose results did not
+    change (e.g. served from Cache) skip re-scoring entirely.
+    """
+    scored = []
+    query_state = _query_terms(query)
+    
+    for i, name in enumerate(names):
+        matches, score = _score_name(name.lower(), *query_state)
+        if matches:
+            scored.append((i, score))
+    
+    # Sort by score (highest first); stable, so ties keep retailer order
+    scored.sort(key=itemgetter(1), reverse=True)
+    
+    return tuple(scored)
+
+
 def filter_by_relevance(products: List[Product], query: str) -> List[Product]:
     """Filter and sort products by relevance to search query."""
-    scored = []
+    ranking = _rank_by_relevance(tuple(p.name for p in products), query)
+    
+    relevant = []
+    for i, score in ranking:
+        p = products[i]
+        p.relevance_score = score  # Store score on product
+        relevant.append(p)
     
+    return relevant
+
+
+def summarize_products(products: List[Product]) -> Tuple[int, int, List[Dict]]:
+    """Return (count, in_stock_count, dicts) in a single pass over products."""
+    in_stock = 0
+    dicts = []
     for p in products:
-        matches, score = matches_query(p.name, query)
-        if matches:
-            p.relevance_score = score  # Store score on product
-            scored.append((p, score))
+        if p.stock:
+            in_stock += 1
+        dicts.append(p.to_dict())
+    return len(dicts), in_stock, dicts
+
+
+def _retailer_summary(
+    products: List[Product],
+    error: Optional[str],
+    query: str,
+) -> Tuple[Dict[str, Any], List[Product]]:
+    """Build a retailer's by_retailer entry and its relevant products, best first."""
+    if error:
+        return {"count": 0, "in_stock": 0, "error": error}, []
     
-    # Sort by score (highest first)
-    scored.sort(key=lambda x: x[1], reverse=True)
+    relevant = filter_by_relevance(products, query)
+    in_stock_count = sum(1 for p in relevant if p.stock)
+    return {"count": len(relevant), "in_stock": in_stock_count}, relevant
+
+
+# Everything that is not str.isalnum() ([\W_] is exactly its complement),
+# stripped in C when building dedup keys
+_DEDUP_STRIP_RE = re.compile(r'[\W_]+')
+
+
+def _extend_unique(target: List[Product], seen: set, products: List[Product]) -> int:
+    """
+    Append products to target, skipping names already in seen.
     
-    return [p for p, _ in scored]
+    Returns how many of the appended products are in stock.
+    """
+    in_stock = 0
+    append = target.append
+    for p in products:
+        # Normalized name key for deduplication by name similarity
+        key = _DEDUP_STRIP_RE.sub('', p.name).lower()[:50]
+        if key not in seen:
+            seen.add(key)
+            append(p)
+            if p.stock:
+                in_stock += 1
+    return in_stock
 
 
 # =============================================================================
@@ -1086,6 +1873,11 @@ class StockChecker:
     def __init__(self, zip_code: str = "90210"):
         self.zip_code = zip_code
     
+    @staticmethod
+    def _retailer_key(retailer: str) -> str:
+        """Normalize a retailer name ("Pokemon Center") to its RETAILERS key."""
+        return retailer.lower().replace(" ", "")
+    
     def _scan_single_retailer(self, name: str, query: str) -> Tuple[str, List[Product], Optional[str]]:
         """Scan a single retailer. Returns (name, products, error)."""
         try:
@@ -1105,6 +1897,17 @@ class StockChecker:
         except Exception as e:
             return (name, [], str(e))
     
+    def _scan_and_summarize(self, name: str, query: str) -> Tuple[str, Dict[str, Any], List[Product], Optional[str]]:
+        """
+        Scan a single retailer and build its summary. Returns (name, entry, relevant, error).
+        
+        Relevance filtering runs here, on the worker thread, so the
+        collecting loop only merges finished results.
+        """
+        name, products, error = self._scan_single_retailer(name, query)
+        entry, relevant = _retailer_summary(products, error, query)
+        return (name, entry, relevant, error)
+    
     def scan_all(self, query: str = "pokemon trading cards", parallel: bool = True) -> Dict[str, Any]:
         """
         Scan all retailers for Pokemon products.
@@ -1114,82 +1917,59 @@ class StockChecker:
             parallel: If True, scan retailers in parallel (faster)
         """
         all_products = []
+        seen = set()  # Dedup keys of products already in all_products
+        in_stock_total = 0
         results = {}
         errors = []
         start_time = time.time()
         
         if parallel:
-            # Parallel scanning - up to 6 retailers at once
-            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-                futures = {
-                    executor.submit(self._scan_single_retailer, name, query): name 
-                    for name in self.RETAILERS
-                }
-                
-                for future in as_completed(futures):
-                    name, products, error = future.result()
-                    
-                    if error:
-                        errors.append(f"{name}: {error}")
-                        results[name] = {"count": 0, "in_stock": 0, "error": error}
-                    else:
-                        # Filter by relevance
-                        relevant_products = filter_by_relevance(products, query)
-                        results[name] = {
-                            "count": len(relevant_products),
-                            "in_stock": len([p for p in relevant_products if p.stock]),
-                        }
-                        all_products.extend([p.to_dict() for p in relevant_products])
+            # Parallel scanning - all retailers at once on the shared pool
+            futures = [
+                _scan_executor.submit(self._scan_and_summarize, name, query)
+                for name in self.RETAILERS
+            ]
+            outcomes = (future.result() for future in as_completed(futures))
         else:
             # Sequential scanning (fallback)
-            for name in self.RETAILERS:
-                _, products, error = self._scan_single_retailer(name, query)
-                
-                if error:
-                    errors.append(f"{name}: {error}")
-                    results[name] = {"count": 0, "in_stock": 0, "error": error}
-                else:
-                    relevant_products = filter_by_relevance(products, query)
-                    results[name] = {
-                        "count": len(relevant_products),
-                        "in_stock": len([p for p in relevant_products if p.stock]),
-                    }
-                    all_products.extend([p.to_dict() for p in relevant_products])
-        
-        # Deduplicate by name similarity
-        seen = set()
-        unique = []
-        for p in all_products:
-            # Create normalized key for deduplication
-            key = ''.join(c.lower() for c in p["name"] if c.isalnum())[:50]
-            if key not in seen:
-                seen.add(key)
-                unique.append(p)
+            outcomes = (self._scan_and_summarize(name, query) for name in self.RETAILERS)
+        
+        for name, entry, relevant, error in outcomes:
+            results[name] = entry
+            if error:
+                errors.append(f"{name}: {error}")
+            else:
+                in_stock_total += _extend_unique(all_products, seen, relevant)
         
         # Sort by stock status (in stock first), then by relevance score
-        unique.sort(key=lambda x: (not x.get("stock", False), -x.get("relevance_score", 0)))
+        all_products.sort(key=lambda p: (not p.stock, -p.relevance_score))
         
-        in_stock = [p for p in unique if p.get("stock")]
-        scan_time = round(time.time() - start_time, 2)
+        # Serialize once, after dedup and sort (dropped duplicates never are)
+        all_products = [p.to_dict() for p in all_products]
+        
+        # In-stock products sort first, so they are exactly the leading slice
+        in_stock = all_products[:in_stock_total]
+        end_time = time.time()
+        scan_time = round(end_time - start_time, 2)
         
         return {
             "success": True,
             "query": query,
             "zip_code": self.zip_code,
-            "total": len(unique),
+            "total": len(all_products),
             "in_stock_count": len(in_stock),
             "by_retailer": results,
-            "products": unique,
+            "products": all_products,
             "in_stock_only": in_stock,
             "errors": errors if errors else None,
-            "checked_at": datetime.now().isoformat(),
+            "checked_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(end_time)),
             "scan_time_seconds": scan_time,
             "parallel": parallel,
         }
     
     def scan_retailer(self, retailer: str, query: str) -> Dict[str, Any]:
         """Scan specific retailer."""
-        retailer_key = retailer.lower().replace(" ", "")
+        retailer_key = self._retailer_key(retailer)
         
         if retailer_key not in self.RETAILERS:
             return {"error": f"Unknown retailer: {retailer}", "available": list(self.RETAILERS.keys())}
@@ -1204,15 +1984,16 @@ class StockChecker:
             
             # Filter by relevance
             relevant_products = filter_by_relevance(products, query)
+            count, in_stock_count, dicts = summarize_products(relevant_products)
             scan_time = round(time.time() - start_time, 2)
             
             return {
                 "success": True,
                 "retailer": retailer,
                 "query": query,
-                "total": len(relevant_products),
-                "in_stock": len([p for p in relevant_products if p.stock]),
-                "products": [p.to_dict() for p in relevant_products],
+                "total": count,
+                "in_stock": in_stock_count,
+                "products": dicts,
                 "scan_time_seconds": scan_time,
             }
         except Exception as e:
@@ -1226,30 +2007,24 @@ class StockChecker:
         start_time = time.time()
         
         # Validate retailers
-        valid_retailers = [r.lower().replace(" ", "") for r in retailers if r.lower().replace(" ", "") in self.RETAILERS]
+        valid_retailers = [key for key in map(self._retailer_key, retailers) if key in self.RETAILERS]
         
         if not valid_retailers:
             return {"error": "No valid retailers specified", "available": list(self.RETAILERS.keys())}
         
-        with ThreadPoolExecutor(max_workers=len(valid_retailers)) as executor:
-            futures = {
-                executor.submit(self._scan_single_retailer, name, query): name 
-                for name in valid_retailers
-            }
+        futures = {
+            _scan_executor.submit(self._scan_and_summarize, name, query): name 
+            for name in valid_retailers
+        }
+        
+        for future in as_completed(futures):
+            name, entry, relevant, error = future.result()
             
-            for future in as_completed(futures):
-                name, products, error = future.result()
-                
-                if error:
-                    errors.append(f"{name}: {error}")
-                    results[name] = {"count": 0, "in_stock": 0, "error": error}
-                else:
-                    relevant_products = filter_by_relevance(products, query)
-                    results[name] = {
-                        "count": len(relevant_products),
-                        "in_stock": len([p for p in relevant_products if p.stock]),
-                    }
-                    all_products.extend([p.to_dict() for p in relevant_products])
+            results[name] = entry
+            if error:
+                errors.append(f"{name}: {error}")
+            else:
+                all_products.extend(p.to_dict() for p in relevant)
         
         scan_time = round(time.time() - start_time, 2)
         
@@ -1258,7 +2033,7 @@ class StockChecker:
             "retailers": valid_retailers,
             "query": query,
             "total": len(all_products),
-            "in_stock_count": len([p for p in all_products if p.get("stock")]),
+            "in_stock_count": sum(r["in_stock"] for r in results.values()),
             "by_retailer": results,
             "products": all_products,
             "errors": errors if errors else None,
@@ -1300,7 +2075,6 @@ def get_available_retailers() -> List[str]:
 # =============================================================================
 
 if __name__ == "__main__":
-    import sys
     import argparse
     
     parser = argparse.ArgumentParser(description="Pokemon Stock Checker")
@@ -1326,7 +2100,10 @@ if __name__ == "__main__":
     else:
         result = scan_all(query, args.zip, parallel=not args.no_parallel)
     
-    print(json.dumps(result, indent=2))
+    if ORJSON_AVAILABLE:
+        print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+    else:
+        print(json.dumps(result, indent=2))
     
     if result.get("scan_time_seconds"):
         print(f"\nScan completed in {result['scan_time_seconds']} seconds")
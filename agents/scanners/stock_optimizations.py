@@ -13,15 +13,37 @@ Advanced optimizations for stock checking:
 8. Response time monitoring (track and adapt)
 """
 import os
+import json
 import time
 import hashlib
 import re
-from typing import Dict, List, Optional, Tuple
+import threading
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 from urllib.robotparser import RobotFileParser
 from urllib.parse import urlparse
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
 from agents.utils.logger import get_logger
 
 logger = get_logger("stock_optimizations")
@@ -41,7 +63,7 @@ class ProductPrioritizer:
     def __init__(self):
         self.product_scores: Dict[str, float] = {}
         self.scan_frequencies: Dict[str, int] = {}  # seconds between scans
-        self.last_scanned: Dict[str, datetime] = {}
+        self.last_scanned: Dict[str, float] = {}  # time.monotonic() of last scan
     
     def calculate_priority(
         self,
@@ -93,15 +115,15 @@ class ProductPrioritizer:
         """Check if product should be scanned now."""
         interval = self.get_scan_interval(priority)
         
-        if product_key not in self.last_scanned:
+        last = self.last_scanned.get(product_key)
+        if last is None:
             return True
         
-        elapsed = (datetime.now() - self.last_scanned[product_key]).total_seconds()
-        return elapsed >= interval
+        return time.monotonic() - last >= interval
     
     def record_scan(self, product_key: str):
         """Record that product was scanned."""
-        self.last_scanned[product_key] = datetime.now()
+        self.last_scanned[product_key] = time.monotonic()
 
 
 # =============================================================================
@@ -117,6 +139,7 @@ class ChangeDetection:
     def __init__(self):
         self.etags: Dict[str, str] = {}
         self.last_modified: Dict[str, datetime] = {}
+        self._unsaved = 0  # Validator changes since the last _save_cache
         cache_file = Path(__file__).parent.parent.parent / ".stock_cache" / "change_detection.json"
         self.cache_file = cache_file
         self._load_cache()
@@ -127,30 +150,32 @@ class ChangeDetection:
             return
         
         try:
-            import json
-            with open(self.cache_file) as f:
-                data = json.load(f)
-                self.etags = data.get("etags", {})
-                self.last_modified = {
-                    k: datetime.fromisoformat(v)
-                    for k, v in data.get("last_modified", {}).items()
-                }
+            raw = self.cache_file.read_bytes()
+            # json.loads accepts bytes too, so both codecs read either writer's file
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+            self.etags = data.get("etags", {})
+            self.last_modified = {
+                k: datetime.fromisoformat(v)
+                for k, v in data.get("last_modified", {}).items()
+            }
         except:
             pass
     
     def _save_cache(self):
         """Save ETag/Last-Modified cache to disk."""
         try:
-            import json
             self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.cache_file, 'w') as f:
-                json.dump({
-                    "etags": self.etags,
-                    "last_modified": {
-                        k: v.isoformat()
-                        for k, v in self.last_modified.items()
-                    },
-                }, f)
+            data = {
+                "etags": self.etags,
+                "last_modified": {
+                    k: v.isoformat()
+                    for k, v in self.last_modified.items()
+                },
+            }
+            if ORJSON_AVAILABLE:
+                self.cache_file.write_bytes(orjson.dumps(data))
+            else:
+                self.cache_file.write_text(json.dumps(data))
         except:
             pass
     
@@ -178,21 +203,26 @@ class ChangeDetection:
         """Process response headers and update cache."""
         # Store ETag if present
         etag = response.headers.get("ETag")
-        if etag:
+        if etag and self.etags.get(url) != etag:
             self.etags[url] = etag
+            self._unsaved += 1
         
         # Store Last-Modified if present
         last_modified = response.headers.get("Last-Modified")
         if last_modified:
             try:
                 from email.utils import parsedate_to_datetime
-                self.last_modified[url] = parsedate_to_datetime(last_modified)
+                parsed = parsedate_to_datetime(last_modified)
+                if self.last_modified.get(url) != parsed:
+                    self.last_modified[url] = parsed
+                    self._unsaved += 1
             except:
                 pass
         
-        # Save cache periodically
-        if len(self.etags) % 10 == 0:
+        # Save cache every 10 changed validators (304s and repeats are free)
+        if self._unsaved >= 10:
             self._save_cache()
+            self._unsaved = 0
     
     def is_not_modified(self, response) -> bool:
         """Check if response is 304 Not Modified."""
@@ -256,6 +286,23 @@ class GeographicMatcher:
 # ROBOTS.TXT RESPECT
 # =============================================================================
 
+ROBOTS_TXT_TTL_SECONDS = 3600  # Refresh interval when robots.txt sends no max-age
+ROBOTS_TXT_MAX_TTL_SECONDS = 86400  # RFC 9309: don't trust a copy older than a day
+ROBOTS_TXT_NEGATIVE_TTL_SECONDS = 60  # Retry after a failed fetch (429/5xx/network)
+_MAX_AGE_RE = re.compile(r'max-age\s*=\s*(\d+)', re.IGNORECASE)
+
+
+@lru_cache(maxsize=8192)
+def _url_to_domain(url: str) -> str:
+    """
+    scheme://netloc for url, the key robots.txt state is cached under.
+    
+    Memoized: scans revisit the same URLs, and urlparse is pure Python.
+    """
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
 class RobotsTxtChecker:
     """
     Check and respect robots.txt crawl delays.
@@ -264,7 +311,19 @@ class RobotsTxtChecker:
     def __init__(self):
         self.parsers: Dict[str, RobotFileParser] = {}
         self.crawl_delays: Dict[str, float] = {}
-        self.last_checked: Dict[str, datetime] = {}
+        self.last_checked: Dict[str, float] = {}  # time.monotonic() of last fetch
+        self.ttls: Dict[str, float] = {}  # Per-domain freshness (Cache-Control max-age)
+        self.validators: Dict[str, Dict[str, str]] = {}  # Conditional GET headers
+        self._inflight: Dict[str, threading.Event] = {}  # Domain -> fetch in progress
+        self._inflight_lock = threading.Lock()
+    
+    def _mark_checked(self, domain: str, resp=None, ttl: float = None):
+        """Record a fetch/revalidation and how long it stays fresh."""
+        self.last_checked[domain] = time.monotonic()
+        if ttl is None:
+            match = _MAX_AGE_RE.search(resp.headers.get("Cache-Control", ""))
+            ttl = min(int(match.group(1)), ROBOTS_TXT_MAX_TTL_SECONDS) if match else ROBOTS_TXT_TTL_SECONDS
+        self.ttls[domain] = ttl
     
     def get_crawl_delay(self, url: str) -> float:
         """
@@ -272,28 +331,61 @@ class RobotsTxtChecker:
         
         Returns delay in seconds, or 0 if not specified.
         """
-        parsed = urlparse(url)
-        domain = f"{parsed.scheme}://{parsed.netloc}"
-        
-        # Check cache (refresh every hour)
-        if domain in self.last_checked:
-            if (datetime.now() - self.last_checked[domain]).total_seconds() < 3600:
+        return self._crawl_delay(_url_to_domain(url))
+    
+    def _crawl_delay(self, domain: str) -> float:
+        """Refresh domain's robots.txt if stale, then return its crawl delay."""
+        # Check cache (fresh for max-age, else an hour; failures for a minute)
+        last = self.last_checked.get(domain)
+        if last is not None:
+            if time.monotonic() - last < self.ttls.get(domain, ROBOTS_TXT_TTL_SECONDS):
                 return self.crawl_delays.get(domain, 0)
         
+        # Singleflight: concurrent misses for a domain share one fetch
+        with self._inflight_lock:
+            event = self._inflight.get(domain)
+            leader = event is None
+            if leader:
+                event = self._inflight[domain] = threading.Event()
+        
+        if not leader:
+            event.wait(timeout=10)
+            return self.crawl_delays.get(domain, 0)
+        
+        try:
+            return self._fetch(domain)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[domain]
+            event.set()
+    
+    def _fetch(self, domain: str) -> float:
+        """Fetch (or revalidate) robots.txt for domain and return its crawl delay."""
         try:
             import requests
             
-            # Fetch robots.txt
+            # Fetch robots.txt (conditionally, once we hold a parsed copy)
             robots_url = f"{domain}/robots.txt"
-            resp = requests.get(robots_url, timeout=5)
+            headers = self.validators.get(domain, {}) if domain in self.parsers else {}
+            resp = requests.get(robots_url, headers=headers, timeout=5)
+            
+            if resp.status_code == 304 and domain in self.parsers:
+                # Unchanged: keep the parsed copy, just extend its freshness
+                self._mark_checked(domain, resp)
+                return self.crawl_delays.get(domain, 0)
             
             if resp.status_code == 200:
-                # Parse robots.txt
-                parser = RobotFileParser()
-                parser.set_url(robots_url)
-                parser.read()
+                # Parse the body already in hand (parser.read() would fetch it again)
+                parser = RobotFileParser(robots_url)
+                parser.parse(resp.text.splitlines())
                 
                 self.parsers[domain] = parser
+                self.validators[domain] = {
+                    header: resp.headers[source]
+                    for header, source in (("If-None-Match", "ETag"), ("If-Modified-Since", "Last-Modified"))
+                    if resp.headers.get(source)
+                }
+                self._mark_checked(domain, resp)
                 
                 # Get crawl delay for our user agent
                 delay = parser.crawl_delay("*")  # Check for all user agents
@@ -302,23 +394,32 @@ class RobotsTxtChecker:
                     logger.info(f"Respecting robots.txt crawl delay: {delay}s for {domain}")
                     return delay
                 
-                self.last_checked[domain] = datetime.now()
+                self.crawl_delays.pop(domain, None)
+                return 0
+            
+            if 400 <= resp.status_code < 500 and resp.status_code != 429:
+                # No robots.txt (404 etc.) is a real answer: no rules, normal TTL
+                self.parsers.pop(domain, None)
+                self.crawl_delays.pop(domain, None)
+                self._mark_checked(domain, resp)
+                return 0
         except Exception as e:
             logger.debug(f"Could not fetch robots.txt for {domain}: {e}")
         
-        return 0
+        # 429/5xx/network failure: keep any previous copy, retry in a minute
+        self._mark_checked(domain, ttl=ROBOTS_TXT_NEGATIVE_TTL_SECONDS)
+        return self.crawl_delays.get(domain, 0)
     
     def can_fetch(self, url: str, user_agent: str = "*") -> bool:
         """Check if URL can be fetched according to robots.txt."""
-        parsed = urlparse(url)
-        domain = f"{parsed.scheme}://{parsed.netloc}"
+        domain = _url_to_domain(url)
         
-        if domain not in self.parsers:
-            # Try to fetch robots.txt
-            self.get_crawl_delay(url)
+        # Same freshness check/fetch as get_crawl_delay, without re-parsing url
+        self._crawl_delay(domain)
         
-        if domain in self.parsers:
-            return self.parsers[domain].can_fetch(user_agent, url)
+        parser = self.parsers.get(domain)
+        if parser is not None:
+            return parser.can_fetch(user_agent, url)
         
         # Default: allow if robots.txt not available
         return True
@@ -328,6 +429,9 @@ class RobotsTxtChecker:
 # ADAPTIVE DELAYS
 # =============================================================================
 
+RESPONSE_EWMA_ALPHA = 0.7  # Weight kept by the running average per new response
+
+
 class AdaptiveDelayManager:
     """
     Adjust delays based on response patterns.
@@ -340,7 +444,7 @@ class AdaptiveDelayManager:
     def __init__(self, base_delay: float = 2.0):
         self.base_delay = base_delay
         self.current_delays: Dict[str, float] = {}
-        self.response_times: Dict[str, List[float]] = {}
+        self.response_ewma: Dict[str, float] = {}  # Smoothed response time per retailer
         self.error_counts: Dict[str, int] = {}
     
     def get_delay(self, retailer: str) -> float:
@@ -352,14 +456,11 @@ class AdaptiveDelayManager:
     
     def record_response(self, retailer: str, response_time: float, success: bool):
         """Record response and adjust delay."""
-        if retailer not in self.response_times:
-            self.response_times[retailer] = []
-        
-        self.response_times[retailer].append(response_time)
-        
-        # Keep only last 10 responses
-        if len(self.response_times[retailer]) > 10:
-            self.response_times[retailer].pop(0)
+        # Exponentially weighted average: one float per retailer, seeded
+        # with the first sample, and a lone outlier only moves it by 30%
+        previous = self.response_ewma.get(retailer, response_time)
+        avg_time = RESPONSE_EWMA_ALPHA * previous + (1 - RESPONSE_EWMA_ALPHA) * response_time
+        self.response_ewma[retailer] = avg_time
         
         # Adjust delay based on performance
         if not success:
@@ -374,8 +475,6 @@ class AdaptiveDelayManager:
             self.error_counts[retailer] = 0
             
             # Adjust based on response time
-            avg_time = sum(self.response_times[retailer]) / len(self.response_times[retailer])
-            
             if avg_time > 5.0:  # Slow responses
                 self.current_delays[retailer] = min(
                     self.current_delays.get(retailer, self.base_delay) * 1.2,
@@ -392,14 +491,52 @@ class AdaptiveDelayManager:
 # STOCK VERIFICATION
 # =============================================================================
 
+VERIFICATION_CACHE_TTL_SECONDS = 60
+VERIFICATION_CACHE_MAX_ENTRIES = 10000
+
+
 class StockVerifier:
     """
     Double-check "in stock" items to reduce false positives.
     """
     
     def __init__(self):
-        self.verification_cache: Dict[str, Tuple[bool, datetime]] = {}
-        self.cache_ttl = 60  # 1 minute
+        self.cache_ttl = VERIFICATION_CACHE_TTL_SECONDS
+        if CACHETOOLS_AVAILABLE:
+            # Entries are fresh by construction; expiry and the size bound are handled lazily
+            self.verification_cache = TTLCache(
+                maxsize=VERIFICATION_CACHE_MAX_ENTRIES, ttl=self.cache_ttl
+            )
+        else:
+            # key -> (stock, monotonic expiry); insertion order is expiry order
+            self.verification_cache: "OrderedDict[str, Tuple[bool, float]]" = OrderedDict()
+    
+    def _cache_get(self, cache_key: str) -> Optional[bool]:
+        """Return the cached stock flag, or None when missing or expired."""
+        if CACHETOOLS_AVAILABLE:
+            return self.verification_cache.get(cache_key)
+        
+        entry = self.verification_cache.get(cache_key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self.verification_cache[cache_key]
+            return None
+        return entry[0]
+    
+    def _cache_put(self, cache_key: str, stock: bool):
+        """Cache a verified stock flag for cache_ttl seconds."""
+        if CACHETOOLS_AVAILABLE:
+            self.verification_cache[cache_key] = stock
+            return
+        
+        cache = self.verification_cache
+        cache.pop(cache_key, None)
+        cache[cache_key] = (stock, time.monotonic() + self.cache_ttl)
+        # Drop expired entries from the front, then enforce the size bound
+        now = time.monotonic()
+        while cache and (len(cache) > VERIFICATION_CACHE_MAX_ENTRIES or next(iter(cache.values()))[1] <= now):
+            cache.popitem(last=False)
     
     def verify_stock(
         self,
@@ -414,10 +551,9 @@ class StockVerifier:
         """
         # Check cache
         cache_key = f"{product.retailer}:{product.url}"
-        if cache_key in self.verification_cache:
-            cached_result, cached_time = self.verification_cache[cache_key]
-            if (datetime.now() - cached_time).total_seconds() < self.cache_ttl:
-                return cached_result, 0.8  # Cached = slightly lower confidence
+        cached_result = self._cache_get(cache_key)
+        if cached_result is not None:
+            return cached_result, 0.8  # Cached = slightly lower confidence
         
         # If product says out of stock, trust it (no need to verify)
         if not product.stock:
@@ -439,7 +575,7 @@ class StockVerifier:
                 confidence = 0.6  # Verification error = medium confidence
         
         # Cache result
-        self.verification_cache[cache_key] = (product.stock, datetime.now())
+        self._cache_put(cache_key, product.stock)
         
         return product.stock, confidence
 
@@ -448,6 +584,35 @@ class StockVerifier:
 # PRODUCT DEDUPLICATION
 # =============================================================================
 
+# Every byte except a-z and 0-9, deleted via bytes.translate when
+# normalizing names (equivalent to re.sub(r'[^a-z0-9]', '', name.lower()))
+_NON_ALNUM_BYTES = bytes(c for c in range(256) if not (48 <= c <= 57 or 97 <= c <= 122))
+
+
+@lru_cache(maxsize=4096)
+def _fingerprint(name: str, price_range: int, retailer: str) -> str:
+    """
+    Hash the normalized name, $5 price bucket and retailer.
+    
+    Memoized on exactly those inputs, so later passes over the same
+    products (or their cached copies) skip normalization and hashing
+    without storing anything on the Product itself.
+    """
+    # Normalize name
+    name_normalized = (
+        name.lower()
+        .encode('ascii', 'ignore')
+        .translate(None, _NON_ALNUM_BYTES)
+        .decode('ascii')
+    )
+    
+    # Generate hash (non-cryptographic: 64 bits is plenty for dedup keys)
+    key = f"{name_normalized}:{price_range}:{retailer}".encode()
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_hexdigest(key)
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
+
 class ProductDeduplicator:
     """
     Better handling of duplicate products across retailers.
@@ -460,18 +625,9 @@ class ProductDeduplicator:
         
         Uses: name (normalized), price range, retailer
         """
-        # Normalize name
-        name_normalized = re.sub(r'[^a-z0-9]', '', product.name.lower())
-        
         # Price range (round to nearest $5)
         price_range = int(product.price / 5) * 5
-        
-        # Generate hash
-        fingerprint = hashlib.md5(
-            f"{name_normalized}:{price_range}:{product.retailer}".encode()
-        ).hexdigest()
-        
-        return fingerprint
+        return _fingerprint(product.name, price_range, product.retailer)
     
     @staticmethod
     def deduplicate(products: List['Product']) -> List['Product']:
@@ -483,35 +639,32 @@ class ProductDeduplicator:
         - Higher confidence
         - Lower price
         """
-        seen = {}
+        best: Dict[str, 'Product'] = {}
+        fingerprint_of = ProductDeduplicator.generate_fingerprint
+        score_of = ProductDeduplicator._keep_score
         
         for product in products:
-            fingerprint = ProductDeduplicator.generate_fingerprint(product)
+            fingerprint = fingerprint_of(product)
+            current = best.get(fingerprint)
             
-            if fingerprint not in seen:
-                seen[fingerprint] = product
-            else:
-                existing = seen[fingerprint]
-                
-                # Prefer in-stock
-                if product.stock and not existing.stock:
-                    seen[fingerprint] = product
-                elif existing.stock and not product.stock:
-                    continue
-                
-                # Prefer higher confidence
-                product_conf = getattr(product, 'confidence', 0.5)
-                existing_conf = getattr(existing, 'confidence', 0.5)
-                if product_conf > existing_conf:
-                    seen[fingerprint] = product
-                elif existing_conf > product_conf:
-                    continue
-                
-                # Prefer lower price (better deal)
-                if product.price < existing.price and product.price > 0:
-                    seen[fingerprint] = product
+            # Most fingerprints are unique, so only collisions pay for scoring
+            if current is None or score_of(product) > score_of(current):
+                best[fingerprint] = product
         
-        return list(seen.values())
+        return list(best.values())
+    
+    @staticmethod
+    def _keep_score(product: 'Product') -> Tuple[bool, float, float]:
+        """
+        One comparable score: in-stock, then confidence, then lower price
+        (a missing/zero price ranks below any real one).
+        """
+        price = product.price
+        return (
+            bool(product.stock),
+            product.confidence,
+            -price if price > 0 else float('-inf'),
+        )
 
 
 # =============================================================================
@@ -524,23 +677,23 @@ class ResponseTimeMonitor:
     """
     
     def __init__(self):
-        self.response_times: Dict[str, List[float]] = {}
+        self.response_times: Dict[str, Deque[float]] = {}
+        self._stats: Dict[str, Dict] = {}  # Per-retailer stats, dropped on each new sample
         self.slow_retailers: set = set()
     
     def record_time(self, retailer: str, response_time: float):
         """Record response time."""
-        if retailer not in self.response_times:
-            self.response_times[retailer] = []
-        
-        self.response_times[retailer].append(response_time)
+        times = self.response_times.get(retailer)
+        if times is None:
+            # Keep only last 20 measurements
+            times = self.response_times[retailer] = deque(maxlen=20)
         
-        # Keep only last 20 measurements
-        if len(self.response_times[retailer]) > 20:
-            self.response_times[retailer].pop(0)
+        times.append(response_time)
+        self._stats.pop(retailer, None)
         
         # Mark as slow if average > 5 seconds
-        if len(self.response_times[retailer]) >= 5:
-            avg_time = sum(self.response_times[retailer]) / len(self.response_times[retailer])
+        if len(times) >= 5:
+            avg_time = sum(times) / len(times)
             if avg_time > 5.0:
                 self.slow_retailers.add(retailer)
                 logger.warning(
@@ -555,16 +708,24 @@ class ResponseTimeMonitor:
         return retailer in self.slow_retailers
     
     def get_stats(self) -> Dict[str, Dict]:
-        """Get response time statistics."""
+        """
+        Get response time statistics.
+        
+        Each retailer's entry is computed once per new sample, so polling
+        this between scans does no work beyond building the outer dict.
+        """
         stats = {}
+        cached = self._stats
         for retailer, times in self.response_times.items():
-            if times:
-                stats[retailer] = {
+            entry = cached.get(retailer)
+            if entry is None:
+                entry = cached[retailer] = {
                     "avg": sum(times) / len(times),
                     "min": min(times),
                     "max": max(times),
                     "count": len(times),
                 }
+            stats[retailer] = dict(entry)
         return stats
 
 
@@ -7,7 +7,7 @@ More efficient and real-time than polling endpoints.
 """
 import json
 import time
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Tuple
 from datetime import datetime
 from flask import Flask, request
 from blinker import Namespace
@@ -54,6 +54,7 @@ class StockSignalHandler:
         self.active_checks: Dict[str, Dict] = {}
         self.sku_watchlist: Dict[str, List[Dict]] = {}  # retailer -> [{"sku": "...", "callback": ...}]
         self.subscribers: List[Callable] = []
+        self._previous_state: Dict[str, Tuple[Any, Any]] = {}  # product key -> (stock, price)
     
     def register_subscriber(self, callback: Callable):
         """Register a subscriber to receive stock updates."""
@@ -162,16 +163,27 @@ class StockSignalHandler:
     def _check_stock_changes(self, result: Dict):
         """Check for stock changes and emit appropriate signals."""
         products = result.get("products", [])
-        previous_state = getattr(self, '_previous_state', {})
+        previous_state = self._previous_state
         
         for product in products:
             product_key = f"{product.get('retailer')}_{product.get('sku')}"
-            previous = previous_state.get(product_key)
+            current = (product.get('stock'), product.get('price'))
+            previous_pair = previous_state.get(product_key)
             
-            if previous:
+            # Unchanged (the common case) costs one lookup and a tuple compare
+            if previous_pair == current:
+                continue
+            
+            # Update state in place
+            previous_state[product_key] = current
+            
+            if previous_pair is not None:
+                prev_stock, prev_price = previous_pair
+                previous = {"stock": prev_stock, "price": prev_price}
+                
                 # Check for stock changes
-                if previous.get('stock') != product.get('stock'):
-                    if product.get('stock'):
+                if prev_stock != current[0]:
+                    if current[0]:
                         stock_found.send(
                             self,
                             product=product,
@@ -185,18 +197,13 @@ class StockSignalHandler:
                         )
                 
                 # Check for price changes
-                if previous.get('price') != product.get('price'):
+                if prev_price != current[1]:
                     price_changed.send(
                         self,
                         product=product,
                         previous=previous,
-                        price_change=product.get('price') - previous.get('price')
+                        price_change=current[1] - prev_price
                     )
-            
-            # Update state
-            previous_state[product_key] = product
-        
-        self._previous_state = previous_state
     
     def watch_sku(self, sku: str, retailer: str, callback: Callable):
         """Watch a specific SKU for stock changes."""
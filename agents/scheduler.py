@@ -7,15 +7,19 @@ Runs scheduled tasks:
 - Periodic stock checks
 - Alert monitoring
 """
+import heapq
+import itertools
 import time
 import threading
-from datetime import datetime, time as dt_time
-from typing import Callable, Optional, Dict, List
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Dict, List, Tuple
 
 from agents.utils.logger import get_logger
 
 logger = get_logger("scheduler")
 
+FAILED_JOB_RETRY_SECONDS = 60  # Failed jobs retry after this, like the old minute tick
+
 
 class Scheduler:
     """Simple scheduler for daily/weekly jobs."""
@@ -24,6 +28,19 @@ class Scheduler:
         self.jobs: List[Dict] = []
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        # Min-heap of (due epoch seconds, tiebreak, job): the loop sleeps
+        # until the earliest due job instead of polling every job each minute
+        self._heap: List[Tuple[float, int, Dict]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()  # New job or stop(): re-check the heap now
+    
+    def _add_job(self, job: Dict):
+        """Register a job and schedule its first run."""
+        self.jobs.append(job)
+        with self._lock:
+            heapq.heappush(self._heap, (self._next_due(job), next(self._seq), job))
+        self._wakeup.set()
     
     def add_daily_job(self, func: Callable, hour: int = 2, minute: int = 0, name: str = None):
         """
@@ -35,7 +52,7 @@ class Scheduler:
             minute: Minute of hour (0-59)
             name: Job name
         """
-        self.jobs.append({
+        self._add_job({
             "func": func,
             "type": "daily",
             "hour": hour,
@@ -54,7 +71,7 @@ class Scheduler:
             interval_seconds: Seconds between runs
             name: Job name
         """
-        self.jobs.append({
+        self._add_job({
             "func": func,
             "type": "interval",
             "interval": interval_seconds,
@@ -63,58 +80,64 @@ class Scheduler:
         })
         logger.info(f"Added interval job: {name or func.__name__} every {interval_seconds}s")
     
-    def _should_run_daily(self, job: Dict) -> bool:
-        """Check if daily job should run."""
+    def _next_due(self, job: Dict) -> float:
+        """Epoch time at which job should next run."""
         now = datetime.now()
         
-        if job["last_run"]:
-            last_run = datetime.fromisoformat(job["last_run"])
-            # Check if it's the right time and hasn't run today
-            if (now.hour == job["hour"] and 
-                now.minute == job["minute"] and
-                (now - last_run).total_seconds() > 3600):  # At least 1 hour since last run
-                return True
-        else:
-            # First run - check if it's past the scheduled time
-            if now.hour >= job["hour"] and now.minute >= job["minute"]:
-                return True
+        if job["type"] == "interval":
+            if not job["last_run"]:
+                return now.timestamp()
+            return job["last_run"].timestamp() + job["interval"]
         
-        return False
+        target = now.replace(hour=job["hour"], minute=job["minute"], second=0, microsecond=0)
+        if target <= now:
+            if not job["last_run"]:
+                # First run - already past today's scheduled time
+                return now.timestamp()
+            target += timedelta(days=1)
+        # Local wall-clock target, so daily jobs stay on time across DST
+        return target.timestamp()
     
-    def _should_run_interval(self, job: Dict) -> bool:
-        """Check if interval job should run."""
-        if not job["last_run"]:
-            return True
-        
-        last_run = datetime.fromisoformat(job["last_run"])
-        elapsed = (datetime.now() - last_run).total_seconds()
-        return elapsed >= job["interval"]
-    
-    def _run_job(self, job: Dict):
-        """Run a job."""
+    def _run_job(self, job: Dict) -> bool:
+        """Run a job. Returns True on success."""
         try:
             logger.info(f"Running job: {job['name']}")
             job["func"]()
-            job["last_run"] = datetime.now().isoformat()
+            job["last_run"] = datetime.now()
             logger.info(f"Job completed: {job['name']}")
+            return True
         except Exception as e:
             logger.error(f"Job failed {job['name']}: {e}")
+            return False
     
     def _run_loop(self):
         """Main scheduler loop."""
         while self.running:
             try:
-                for job in self.jobs:
-                    if job["type"] == "daily" and self._should_run_daily(job):
-                        self._run_job(job)
-                    elif job["type"] == "interval" and self._should_run_interval(job):
-                        self._run_job(job)
+                self._wakeup.clear()
+                with self._lock:
+                    job = None
+                    delay = None
+                    if self._heap:
+                        delay = self._heap[0][0] - time.time()
+                        if delay <= 0:
+                            _, _, job = heapq.heappop(self._heap)
+                
+                if job is None:
+                    # Sleep until the earliest job is due, a job is added, or stop()
+                    self._wakeup.wait(delay)
+                    continue
                 
-                time.sleep(60)  # Check every minute
+                if self._run_job(job):
+                    due = self._next_due(job)
+                else:
+                    due = time.time() + FAILED_JOB_RETRY_SECONDS
+                with self._lock:
+                    heapq.heappush(self._heap, (due, next(self._seq), job))
                 
             except Exception as e:
                 logger.error(f"Scheduler error: {e}")
-                time.sleep(60)
+                self._wakeup.wait(60)
     
     def start(self):
         """Start the scheduler."""
@@ -129,6 +152,7 @@ class Scheduler:
     def stop(self):
         """Stop the scheduler."""
         self.running = False
+        self._wakeup.set()
         if self.thread:
             self.thread.join(timeout=5)
         logger.info("Scheduler stopped")
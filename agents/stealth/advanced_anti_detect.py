@@ -16,7 +16,10 @@ import os
 import random
 import time
 import hashlib
-from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any, Deque, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
@@ -30,24 +33,28 @@ except ImportError:
 # RESIDENTIAL PROXY DETECTION & ROTATION
 # =============================================================================
 
+# Smartproxy, Bright Data, Oxylabs use residential IPs (all lowercase)
+RESIDENTIAL_INDICATORS = (
+    "residential",
+    "res-",
+    "res_",
+    "gate.smartproxy.com",
+    "gate.decodo.com",
+    "brd.superproxy.io",  # Bright Data
+    "rotating-residential",  # Oxylabs
+)
+
+
+@lru_cache(maxsize=512)
 def is_residential_proxy(proxy_url: str) -> bool:
     """
     Detect if proxy is residential (vs datacenter).
     
-    Residential proxies are less likely to be blocked.
+    Residential proxies are less likely to be blocked. Memoized, since the
+    same few pool URLs are classified over and over.
     """
-    # Smartproxy, Bright Data, Oxylabs use residential IPs
-    residential_indicators = [
-        "residential",
-        "res-",
-        "res_",
-        "gate.smartproxy.com",
-        "gate.decodo.com",
-        "brd.superproxy.io",  # Bright Data
-        "rotating-residential",  # Oxylabs
-    ]
-    
-    return any(indicator in proxy_url.lower() for indicator in residential_indicators)
+    proxy_lower = proxy_url.lower()
+    return any(indicator in proxy_lower for indicator in RESIDENTIAL_INDICATORS)
 
 
 def get_residential_proxy_pool() -> List[str]:
@@ -291,16 +298,17 @@ class DistributedScanner:
         self.current_index = (self.current_index + 1) % len(self.proxy_pool)
         
         # Track proxy usage
-        if proxy not in self.proxy_stats:
-            self.proxy_stats[proxy] = {
+        stats = self.proxy_stats.get(proxy)
+        if stats is None:
+            stats = self.proxy_stats[proxy] = {
                 "requests": 0,
                 "successes": 0,
                 "failures": 0,
-                "last_used": None,
+                "last_used": None,  # time.monotonic() of last rotation
             }
         
-        self.proxy_stats[proxy]["requests"] += 1
-        self.proxy_stats[proxy]["last_used"] = datetime.now()
+        stats["requests"] += 1
+        stats["last_used"] = time.monotonic()
         
         return proxy
     
@@ -319,17 +327,17 @@ class DistributedScanner:
         if not self.proxy_stats:
             return self.get_next_proxy()
         
-        # Sort by success rate
-        sorted_proxies = sorted(
+        # Best success rate in one pass (ties keep the earliest proxy, as the
+        # stable descending sort did)
+        best_proxy, _ = max(
             self.proxy_stats.items(),
             key=lambda x: (
                 x[1]["successes"] / max(x[1]["requests"], 1),
                 -x[1]["failures"]  # Prefer fewer failures
             ),
-            reverse=True
         )
         
-        return sorted_proxies[0][0] if sorted_proxies else None
+        return best_proxy
 
 
 # =============================================================================
@@ -416,6 +424,26 @@ class BrowsingPattern:
         "category_then_search": 0.3,  # 30% browse category first
     }
     
+    # Built once: random.choices otherwise re-accumulates the weights per call
+    _PATTERN_NAMES = tuple(PATTERNS)
+    _PATTERN_CUM_WEIGHTS = tuple(accumulate(PATTERNS.values()))
+    
+    BASE_URLS = {
+        "target": "https://www.target.com",
+        "bestbuy": "https://www.bestbuy.com",
+        "gamestop": "https://www.gamestop.com",
+        "pokemoncenter": "https://www.pokemoncenter.com",
+        "costco": "https://www.costco.com",
+        "amazon": "https://www.amazon.com",
+    }
+    
+    CATEGORY_URLS = {
+        "target": "https://www.target.com/c/trading-cards-games-toys/-/N-5xt8l",
+        "bestbuy": "https://www.bestbuy.com/site/searchpage.jsp?st=pokemon",
+        "gamestop": "https://www.gamestop.com/toys-games/trading-cards",
+        "pokemoncenter": "https://www.pokemoncenter.com/category/trading-cards",
+    }
+    
     @staticmethod
     def get_browsing_sequence(retailer: str) -> List[str]:
         """
@@ -424,33 +452,20 @@ class BrowsingPattern:
         Returns list of URLs to visit in order.
         """
         pattern = random.choices(
-            list(BrowsingPattern.PATTERNS.keys()),
-            weights=list(BrowsingPattern.PATTERNS.values())
+            BrowsingPattern._PATTERN_NAMES,
+            cum_weights=BrowsingPattern._PATTERN_CUM_WEIGHTS,
         )[0]
         
-        base_urls = {
-            "target": "https://www.target.com",
-            "bestbuy": "https://www.bestbuy.com",
-            "gamestop": "https://www.gamestop.com",
-            "pokemoncenter": "https://www.pokemoncenter.com",
-            "costco": "https://www.costco.com",
-            "amazon": "https://www.amazon.com",
-        }
-        
-        base = base_urls.get(retailer.lower(), "https://www.example.com")
-        
         if pattern == "direct_search":
             return []  # Skip warm-up
-        elif pattern == "homepage_then_search":
+        
+        retailer = retailer.lower()
+        base = BrowsingPattern.BASE_URLS.get(retailer, "https://www.example.com")
+        
+        if pattern == "homepage_then_search":
             return [base]
         elif pattern == "category_then_search":
-            category_urls = {
-                "target": f"{base}/c/trading-cards-games-toys/-/N-5xt8l",
-                "bestbuy": f"{base}/site/searchpage.jsp?st=pokemon",
-                "gamestop": f"{base}/toys-games/trading-cards",
-                "pokemoncenter": f"{base}/category/trading-cards",
-            }
-            return [category_urls.get(retailer.lower(), base)]
+            return [BrowsingPattern.CATEGORY_URLS.get(retailer, base)]
         
         return []
 
@@ -467,20 +482,21 @@ class RateLimitMonitor:
     """
     
     def __init__(self):
-        self.rate_limit_events: List[datetime] = []
+        self.rate_limit_events: Deque[datetime] = deque()  # Oldest first
         self.backoff_until: Optional[datetime] = None
         self.current_backoff_seconds = 60
     
     def record_rate_limit(self):
         """Record a rate limit event."""
         now = datetime.now()
-        self.rate_limit_events.append(now)
+        events = self.rate_limit_events
+        events.append(now)
         
-        # Keep only last hour
-        self.rate_limit_events = [
-            event for event in self.rate_limit_events
-            if (now - event).total_seconds() < 3600
-        ]
+        # Keep only last hour: events are in time order, so expired ones
+        # are all at the front and nothing newer is touched
+        cutoff = now - timedelta(hours=1)
+        while events[0] <= cutoff:
+            events.popleft()
         
         # Exponential backoff
         self.current_backoff_seconds = min(
@@ -506,7 +522,15 @@ class RateLimitMonitor:
     def get_rate_limit_count(self, window_minutes: int = 60) -> int:
         """Get number of rate limits in time window."""
         cutoff = datetime.now() - timedelta(minutes=window_minutes)
-        return len([e for e in self.rate_limit_events if e > cutoff])
+        
+        # Walk back from the newest event and stop at the first one outside
+        # the window, instead of scanning the whole history
+        count = 0
+        for event in reversed(self.rate_limit_events):
+            if event <= cutoff:
+                break
+            count += 1
+        return count
 
 
 # =============================================================================
@@ -23,6 +23,8 @@ from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # =============================================================================
 # USER AGENTS - Realistic browser signatures
@@ -199,6 +201,64 @@ def get_random_proxy() -> Optional[Dict[str, str]]:
 # STEALTH SESSION
 # =============================================================================
 
+# =============================================================================
+# CONNECTION POOLING
+# =============================================================================
+
+SESSION_POOL_SIZE = 16
+
+# Retry never mutates itself (increment() returns a copy), so one instance
+# is safe to share across every adapter. Only transient 5xx are retried:
+# 429s go back to the caller so the rate-limit/backoff logic sees them, the
+# last failed response is returned rather than raised, and Retry-After is
+# ignored so a server can't park a scan thread.
+_RETRY_STRATEGY = Retry(
+    total=2,
+    backoff_factor=0.3,
+    status_forcelist=(500, 502, 503, 504),
+    raise_on_status=False,
+    respect_retry_after_header=False,
+)
+
+# Shared by StealthSessions that don't persist cookies, so their requests
+# (e.g. a warm-up homepage + category page) reuse keep-alive connections
+# instead of paying a new TLS handshake each time. The connection pool lives
+# in the adapter, so each request can still get its own Session (and cookie
+# jar) without redialing.
+_stateless_adapter = HTTPAdapter(
+    pool_connections=SESSION_POOL_SIZE,
+    pool_maxsize=SESSION_POOL_SIZE,
+    max_retries=_RETRY_STRATEGY,
+)
+
+
+def _mount(session: requests.Session, adapter: HTTPAdapter) -> requests.Session:
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _new_pooled_session() -> requests.Session:
+    """Create a session with a connection pool sized for parallel scans."""
+    adapter = HTTPAdapter(
+        pool_connections=SESSION_POOL_SIZE,
+        pool_maxsize=SESSION_POOL_SIZE,
+        max_retries=_RETRY_STRATEGY,
+    )
+    return _mount(requests.Session(), adapter)
+
+
+def _new_stateless_session() -> requests.Session:
+    """
+    Create a session with a fresh cookie jar on the shared connection pool.
+
+    Cookies still follow redirects within one request (set-cookie-then-302
+    bot checks), but nothing carries over to the next request. Don't close
+    the returned session: that would close the shared adapter.
+    """
+    return _mount(requests.Session(), _stateless_adapter)
+
+
 class StealthSession:
     """
     A requests session with anti-detection features.
@@ -237,7 +297,7 @@ class StealthSession:
         self.persist_cookies = persist_cookies
         self.cookie_jar_file = cookie_jar_file
         
-        self.session = requests.Session() if persist_cookies else None
+        self.session = _new_pooled_session() if persist_cookies else None
         self.last_request_time: Optional[datetime] = None
         self.request_count = 0
         self.current_user_agent: Optional[str] = None  # Track for consistency
@@ -251,7 +311,7 @@ class StealthSession:
         """Get or create session."""
         if self.persist_cookies and self.session:
             return self.session
-        return requests.Session()
+        return _new_stateless_session()
     
     def _load_cookies(self):
         """Load cookies from file if exists."""
@@ -121,6 +121,18 @@ CAPTCHA_PATTERNS = {
     ],
 }
 
+# Compiled once at import: one combined scan rules out clean pages, and the
+# per-pattern regexes are only consulted to attribute indicators on a hit.
+_COMPILED_CAPTCHA_PATTERNS = [
+    (captcha_type, pattern, re.compile(pattern, re.IGNORECASE))
+    for captcha_type, patterns in CAPTCHA_PATTERNS.items()
+    for pattern in patterns
+]
+_ANY_CAPTCHA_RE = re.compile(
+    "|".join(f"(?:{pattern})" for _, pattern, _ in _COMPILED_CAPTCHA_PATTERNS),
+    re.IGNORECASE,
+)
+
 # HTTP status codes that indicate blocking
 BLOCKING_STATUS_CODES = {
     403: "Forbidden - likely blocked",
@@ -166,8 +178,6 @@ def detect_captcha(
         except:
             pass
     
-    content_lower = content.lower()
-    
     # Check status code
     if response is not None:
         if response.status_code in BLOCKING_STATUS_CODES:
@@ -175,9 +185,9 @@ def detect_captcha(
             detected_types.append(CaptchaType.GENERIC)
     
     # Check for specific CAPTCHA types
-    for captcha_type, patterns in CAPTCHA_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, content_lower, re.IGNORECASE):
+    if _ANY_CAPTCHA_RE.search(content):
+        for captcha_type, pattern, regex in _COMPILED_CAPTCHA_PATTERNS:
+            if regex.search(content):
                 indicators.append(f"{captcha_type.value}: {pattern}")
                 if captcha_type not in detected_types:
                     detected_types.append(captcha_type)
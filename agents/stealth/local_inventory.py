@@ -687,7 +687,7 @@ class LocalInventoryScanner:
             for r in all_results
         ]
         
-        in_stock_count = len([r for r in all_results if r.in_stock])
+        in_stock_count = sum(1 for r in all_results if r.in_stock)
         
         return {
             "retailer": retailer,
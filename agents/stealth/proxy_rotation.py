@@ -19,10 +19,18 @@ from pathlib import Path
 from collections import deque
 import threading
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from agents.utils.logger import get_logger
 
 logger = get_logger("proxy_rotation")
 
+PROXY_STATE_FILE = Path(__file__).parent.parent.parent / ".stock_cache" / "proxy_state.json"
+
 
 # =============================================================================
 # PROXY POOL MANAGEMENT
@@ -46,32 +54,36 @@ class ProxyPool:
     
     def _load_state(self):
         """Load proxy state from disk."""
-        state_file = Path(__file__).parent.parent.parent / ".stock_cache" / "proxy_state.json"
-        if state_file.exists():
+        if PROXY_STATE_FILE.exists():
             try:
-                with open(state_file) as f:
-                    data = json.load(f)
-                    self.blocked_proxies = {
-                        k: datetime.fromisoformat(v)
-                        for k, v in data.get("blocked_proxies", {}).items()
-                    }
-                    self.proxy_stats = data.get("proxy_stats", {})
+                raw = PROXY_STATE_FILE.read_bytes()
+                data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                self.blocked_proxies = {
+                    k: datetime.fromisoformat(v)
+                    for k, v in data.get("blocked_proxies", {}).items()
+                }
+                self.proxy_stats = data.get("proxy_stats", {})
             except:
                 pass
     
     def _save_state(self):
         """Save proxy state to disk."""
-        state_file = Path(__file__).parent.parent.parent / ".stock_cache" / "proxy_state.json"
-        state_file.parent.mkdir(parents=True, exist_ok=True)
+        PROXY_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
         try:
-            with open(state_file, 'w') as f:
-                json.dump({
-                    "blocked_proxies": {
-                        k: v.isoformat()
-                        for k, v in self.blocked_proxies.items()
-                    },
-                    "proxy_stats": self.proxy_stats,
-                }, f)
+            data = {
+                "blocked_proxies": {
+                    k: v.isoformat()
+                    for k, v in self.blocked_proxies.items()
+                },
+                "proxy_stats": self.proxy_stats,
+            }
+            payload = orjson.dumps(data) if ORJSON_AVAILABLE else json.dumps(data).encode()
+            
+            # Write a sibling file and swap it in, so a crash mid-write never
+            # leaves a truncated state file for _load_state to discard
+            tmp_file = PROXY_STATE_FILE.with_suffix(".json.tmp")
+            tmp_file.write_bytes(payload)
+            os.replace(tmp_file, PROXY_STATE_FILE)
         except:
             pass
     
@@ -161,7 +173,7 @@ class ProxyPool:
             # Update last used
             proxy_id = proxy["id"]
             if proxy_id in self.proxy_stats:
-                self.proxy_stats[proxy_id]["last_used"] = datetime.now().isoformat()
+                self.proxy_stats[proxy_id]["last_used"] = now.isoformat()  # Same tick as the block check
             
             return proxy
     
@@ -290,6 +302,11 @@ def get_proxy_pool() -> ProxyPool:
     """Get or create the global proxy pool."""
     global _proxy_pool
     
+    # Fast path: once initialized the pool never changes until reset
+    pool = _proxy_pool
+    if pool is not None:
+        return pool
+    
     with _pool_lock:
         if _proxy_pool is None:
             _proxy_pool = ProxyPool()
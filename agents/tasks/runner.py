@@ -24,6 +24,14 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 
 from tasks.task_db import list_enabled_tasks_with_groups, set_runner_heartbeat, update_task_run
 
+# Resolved once at import; a failure is reported on every task run instead.
+try:
+    from scanners.stock_checker import scan_retailer as _scan_retailer  # type: ignore
+    _SCAN_IMPORT_ERROR: Optional[str] = None
+except Exception as e:
+    _scan_retailer = None
+    _SCAN_IMPORT_ERROR = f"import scan_retailer failed: {e}"
+
 
 def _parse_iso(dt_str: Optional[str]) -> Optional[datetime]:
     if not dt_str:
@@ -263,14 +271,12 @@ class TaskRunner:
         now = _utc_now()
         update_task_run(task_id, last_run_at=now.isoformat(), last_status="running", last_error=None)
 
-        try:
-            from scanners.stock_checker import scan_retailer  # type: ignore
-        except Exception as e:
-            update_task_run(task_id, last_status="error", last_error=f"import scan_retailer failed: {e}")
-            return {"task_id": task_id, "success": False, "error": f"import scan_retailer failed: {e}"}
+        if _scan_retailer is None:
+            update_task_run(task_id, last_status="error", last_error=_SCAN_IMPORT_ERROR)
+            return {"task_id": task_id, "success": False, "error": _SCAN_IMPORT_ERROR}
 
         try:
-            result = scan_retailer(retailer, query, zip_code)
+            result = _scan_retailer(retailer, query, zip_code)
         except Exception as e:
             update_task_run(task_id, last_status="error", last_error=str(e))
             return {"task_id": task_id, "success": False, "error": str(e)}
@@ -9,7 +9,7 @@ import os
 import time
 from typing import Optional, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
 
 from agents.utils.logger import get_logger
 
@@ -67,7 +67,7 @@ class RedisRateLimiter:
         self.use_redis = False
         
         # Fallback: in-memory rate limiting
-        self.memory_limits: defaultdict = defaultdict(list)
+        self.memory_limits: defaultdict = defaultdict(deque)  # key -> request times, oldest first
         
         if REDIS_AVAILABLE:
             try:
@@ -144,29 +144,29 @@ class RedisRateLimiter:
     
     def _check_memory(self, key: str) -> Tuple[bool, int, int]:
         """Check rate limit using in-memory storage."""
-        now = time.time()
+        # Monotonic, so appends stay sorted and the oldest entry is always first
+        now = time.monotonic()
         window_start = now - self.window_seconds
+        timestamps = self.memory_limits[key]
         
-        # Clean old entries
-        self.memory_limits[key] = [
-            t for t in self.memory_limits[key] if t > window_start
-        ]
+        # Clean old entries (all at the front)
+        while timestamps and timestamps[0] <= window_start:
+            timestamps.popleft()
         
         # Check limit
-        current_count = len(self.memory_limits[key])
+        current_count = len(timestamps)
         
         if current_count >= self.max_requests:
             # Calculate reset time
-            if self.memory_limits[key]:
-                oldest = min(self.memory_limits[key])
-                reset_after = int(oldest + self.window_seconds - now)
+            if timestamps:
+                reset_after = int(timestamps[0] + self.window_seconds - now)
             else:
                 reset_after = self.window_seconds
             
             return False, 0, max(0, reset_after)
         
         # Add current request
-        self.memory_limits[key].append(now)
+        timestamps.append(now)
         
         remaining = self.max_requests - current_count - 1
         reset_after = self.window_seconds
@@ -87,6 +87,7 @@ def check_and_unblock():
     
     now = datetime.now()
     unblocked_count = 0
+    dirty = False  # Write the blocked list back once, after all retailers
     
     for retailer, blocked_time in list(blocked.items()):
         elapsed = now - blocked_time
@@ -101,7 +102,7 @@ def check_and_unblock():
             if is_accessible:
                 # Unblock it
                 blocked.pop(retailer, None)
-                save_blocked_retailers(blocked)
+                dirty = True
                 unblocked_count += 1
                 print(f"✅ {retailer} is accessible again - UNBLOCKED")
                 print(f"   {message}")
@@ -109,7 +110,10 @@ def check_and_unblock():
                 print(f"🚫 {retailer} still blocked - {message}")
                 # Update blocked time to now (extend block)
                 blocked[retailer] = now
-                save_blocked_retailers(blocked)
+                dirty = True
+    
+    if dirty:
+        save_blocked_retailers(blocked)
     
     return unblocked_count
 
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test Scheduler
+
+Drives the heap-based scheduler loop on a fake clock and checks when jobs
+fire: interval spacing, a daily job's first run before and after its
+HH:MM, and the retry delay after a failed job.
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents import scheduler as scheduler_module
+from agents.scheduler import FAILED_JOB_RETRY_SECONDS, Scheduler
+
+
+class FakeClock:
+    """Epoch clock that only moves when the scheduler sleeps."""
+
+    def __init__(self, start: datetime, until: datetime):
+        self.t = start.timestamp()
+        self.until = until.timestamp()
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.t)
+
+
+def _run(start: datetime, until: datetime, setup):
+    """
+    Run a Scheduler's loop from start until the clock passes until.
+
+    setup(scheduler, record) adds jobs; record(name) is a job body that
+    logs the (name, datetime) it fired at. Returns the fire log.
+    """
+    clock = FakeClock(start, until)
+    fired = []
+    sched = Scheduler()
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock.now()
+
+    class FakeEvent:
+        def set(self):
+            pass
+
+        def clear(self):
+            pass
+
+        def wait(self, timeout=None):
+            if timeout is None or clock.t + timeout > clock.until:
+                sched.running = False
+                return True
+            clock.t += timeout
+            return False
+
+    def record(name, fail_times=0):
+        calls = {"n": 0}
+
+        def job():
+            fired.append((name, datetime.fromtimestamp(round(clock.t))))
+            calls["n"] += 1
+            if calls["n"] <= fail_times:
+                raise RuntimeError("boom")
+        job.__name__ = name
+        return job
+
+    with mock.patch.object(scheduler_module, "datetime", FakeDatetime), \
+            mock.patch.object(scheduler_module, "time", SimpleNamespace(time=lambda: clock.t)):
+        sched._wakeup = FakeEvent()
+        setup(sched, record)
+        sched.running = True
+        sched._run_loop()
+
+    return fired
+
+
+def _times(fired, name):
+    return [t for n, t in fired if n == name]
+
+
+def test_interval_and_daily_order():
+    day = datetime(2026, 3, 2)
+    fired = _run(
+        day.replace(hour=1), day.replace(hour=3),
+        lambda s, record: (
+            s.add_interval_job(record("interval"), interval_seconds=20 * 60),
+            s.add_daily_job(record("daily"), hour=2, minute=0),
+        ),
+    )
+
+    assert _times(fired, "interval") == [
+        day.replace(hour=1), day.replace(hour=1, minute=20), day.replace(hour=1, minute=40),
+        day.replace(hour=2), day.replace(hour=2, minute=20), day.replace(hour=2, minute=40),
+        day.replace(hour=3),
+    ], fired
+    assert _times(fired, "daily") == [day.replace(hour=2)], fired
+    assert [t for _, t in fired] == sorted(t for _, t in fired), "jobs fired out of order"
+
+
+def test_daily_first_run_before_time():
+    day = datetime(2026, 3, 2)
+    fired = _run(
+        day.replace(hour=1), datetime(2026, 3, 3, 3),
+        lambda s, record: s.add_daily_job(record("daily"), hour=2, minute=30),
+    )
+
+    # Waits for today's HH:MM, then fires at the same time tomorrow
+    assert _times(fired, "daily") == [
+        day.replace(hour=2, minute=30), datetime(2026, 3, 3, 2, 30),
+    ], fired
+
+
+def test_daily_first_run_after_time():
+    day = datetime(2026, 3, 2)
+    fired = _run(
+        day.replace(hour=5), datetime(2026, 3, 3, 5),
+        lambda s, record: s.add_daily_job(record("daily"), hour=2, minute=30),
+    )
+
+    # Already past today's HH:MM: run now, then back on schedule tomorrow
+    assert _times(fired, "daily") == [
+        day.replace(hour=5), datetime(2026, 3, 3, 2, 30),
+    ], fired
+
+
+def test_failed_job_retries():
+    start = datetime(2026, 3, 2, 1)
+    fired = _run(
+        start, start.replace(hour=3),
+        lambda s, record: s.add_interval_job(record("flaky", fail_times=1), interval_seconds=3600),
+    )
+
+    retry = datetime.fromtimestamp(start.timestamp() + FAILED_JOB_RETRY_SECONDS)
+    # Fails at start, retries after FAILED_JOB_RETRY_SECONDS, then the
+    # interval counts from the successful run
+    assert _times(fired, "flaky") == [
+        start, retry, datetime.fromtimestamp(retry.timestamp() + 3600),
+    ], fired
+
+
+def main():
+    print("=" * 70)
+    print("⏰ SCHEDULER TEST")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_interval_and_daily_order,
+        test_daily_first_run_before_time,
+        test_daily_first_run_after_time,
+        test_failed_job_retries,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
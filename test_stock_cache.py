@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test Stock Cache
+
+Covers the SQLite-backed scanner cache: set/get, copy-on-read, expiry,
+clear, and the ETag/Last-Modified 304 revalidation round-trip. Runs
+against a temporary database, so the real .stock_cache is never touched.
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agents.scanners import stock_checker
+from agents.scanners.stock_checker import Cache, Product
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def _use_temp_db():
+    """Point the cache at a fresh temporary database."""
+    tmp = Path(tempfile.mkdtemp(prefix="stock-cache-test-"))
+    with stock_checker._cache_db_lock:
+        if stock_checker._cache_db is not None:
+            stock_checker._cache_db.close()
+        stock_checker._cache_db = None
+        stock_checker.CACHE_DIR = tmp
+        stock_checker.CACHE_DB_PATH = tmp / "cache.db"
+    with stock_checker._cache_mem_lock:
+        stock_checker._cache_mem.clear()
+
+
+def _flush_writes():
+    """Wait for queued background writes to land."""
+    stock_checker._cache_writer.submit(lambda: None).result()
+
+
+def _forget_memory():
+    """Drop the in-memory LRU so reads go to SQLite."""
+    with stock_checker._cache_mem_lock:
+        stock_checker._cache_mem.clear()
+
+
+def _expire(retailer, query):
+    """Backdate an entry past the default TTL."""
+    old = time.time() - stock_checker.CACHE_TTL_SECONDS - 60
+    stock_checker._cache_writer.submit(Cache._touch, Cache.key(retailer, query), old).result()
+    _forget_memory()
+
+
+def _products():
+    return [
+        Product(name="Prismatic Evolutions ETB", retailer="Target", price=49.99,
+                url="https://example.com/etb", sku="123", stock=True),
+        Product(name="Surging Sparks Booster", retailer="Target", price=4.99,
+                url="https://example.com/booster", sku="456"),
+    ]
+
+
+def test_set_get():
+    _use_temp_db()
+    data = [p.to_dict() for p in _products()]
+    Cache.set("target", "etb", data)
+
+    assert Cache.get("target", "etb") == data
+    _flush_writes()
+    _forget_memory()
+    assert Cache.get("target", "etb") == data, "SQLite read-through failed"
+    assert Cache.get("target", "other") is None
+
+
+def test_returned_data_is_a_copy():
+    _use_temp_db()
+    data = [{"name": "a", "price": 1.0}]
+    Cache.set("target", "etb", data)
+
+    # Mutating the list given to set() must not reach the cache...
+    data.append({"name": "b"})
+    data[0]["price"] = 99.0
+    assert Cache.get("target", "etb") == [{"name": "a", "price": 1.0}]
+
+    # ...nor mutating a list get() returned
+    first = Cache.get("target", "etb")
+    first[0]["price"] = 99.0
+    first.clear()
+    assert Cache.get("target", "etb") == [{"name": "a", "price": 1.0}]
+
+
+def test_expiry():
+    _use_temp_db()
+    Cache.set("target", "etb", [p.to_dict() for p in _products()])
+    _flush_writes()
+    _expire("target", "etb")
+
+    assert Cache.get("target", "etb") is None
+    assert Cache.get_products("target", "etb") is None
+    assert Cache.get("target", "etb", ttl_override=3600) is not None
+
+
+def test_clear():
+    _use_temp_db()
+    Cache.set("target", "etb", [{"name": "a"}])
+    Cache.set("walmart", "etb", [{"name": "b"}])
+
+    Cache.clear("target")
+    assert Cache.get("target", "etb") is None
+    assert Cache.get("walmart", "etb") is not None
+
+    Cache.clear()
+    _forget_memory()
+    assert Cache.get("walmart", "etb") is None
+
+
+def test_revalidation_round_trip():
+    _use_temp_db()
+    products = _products()
+    response = FakeResponse({
+        "ETag": '"abc123"',
+        "Last-Modified": "Wed, 14 Oct 2026 10:00:00 GMT",
+    })
+    Cache.set_products("target", "etb", products, response)
+    _flush_writes()
+
+    assert Cache.validators("target", "etb") == {
+        "If-None-Match": '"abc123"',
+        "If-Modified-Since": "Wed, 14 Oct 2026 10:00:00 GMT",
+    }
+    assert Cache.validators("target", "missing") == {}
+
+    # Validators outlive the TTL; that's what makes the 304 possible
+    _expire("target", "etb")
+    assert Cache.get_products("target", "etb") is None
+    assert "If-None-Match" in Cache.validators("target", "etb")
+
+    revalidated = Cache.revalidated_products("target", "etb", last_checked="now")
+    assert [p.sku for p in revalidated] == ["123", "456"]
+    assert all(p.last_checked == "now" for p in revalidated)
+
+    # The 304 restarted the TTL, in memory and on disk
+    assert Cache.get_products("target", "etb") is not None
+    _flush_writes()
+    _forget_memory()
+    assert Cache.get_products("target", "etb") is not None
+
+    assert Cache.revalidated_products("target", "missing") is None
+
+
+def main():
+    print("=" * 70)
+    print("🗄️  STOCK CACHE TEST")
+    print("=" * 70)
+    print()
+
+    tests = [
+        test_set_get,
+        test_returned_data_is_a_copy,
+        test_expiry,
+        test_clear,
+        test_revalidation_round_trip,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    print()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())